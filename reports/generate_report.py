@@ -2,7 +2,8 @@
 """
 Open Build Automation Dashboard Generator
 Creates a comprehensive HTML report showing automation status, configuration, and logs
-Includes data retention policies (30 days) and automatic cleanup
+Includes data retention policies (30 days) and automatic cleanup; weekly and
+monthly rollups keep the long-term trends
 """
 
 import sqlite3
@@ -16,7 +17,11 @@ from pathlib import Path
 os.chdir(Path(__file__).parent.parent)
 
 def clean_old_data():
-    """Clean old data from database and reports (keep only last 30 days)"""
+    """Clean old data from database and reports (keep only last 30 days)
+    
+    daily_stats and analytics_tracking are also summarized in the
+    daily_stats_rollup and analytics_rollup tables, which are never pruned.
+    """
     try:
         conn = sqlite3.connect('outreach_automation.db')
         cursor = conn.cursor()
@@ -139,6 +144,7 @@ def get_database_stats():
             'total_targets': 0,
             'targets_by_category': [],
             'daily_stats': [],
+            'weekly_trends': [],
             'weekly_summary': {'targets': 0, 'emails': 0, 'responses': 0},
             'monthly_summary': {'targets': 0, 'emails': 0, 'responses': 0},
             'recent_outreach': [],
@@ -168,6 +174,22 @@ def get_database_stats():
         """, (month_ago,))
         stats['daily_stats'] = cursor.fetchall()
         
+        # Weekly trends for the last year, from the rollups that outlive the daily rows
+        year_ago = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
+        try:
+            cursor.execute("""
+                SELECT d.bucket, d.new_targets_found, d.emails_sent, d.responses_received,
+                       d.total_targets, COALESCE(a.github_stars, 0)
+                FROM daily_stats_rollup d
+                LEFT JOIN analytics_rollup a ON a.period = d.period AND a.bucket = d.bucket
+                WHERE d.period = 'week' AND d.bucket >= ?
+                ORDER BY d.bucket DESC
+            """, (year_ago,))
+            stats['weekly_trends'] = cursor.fetchall()
+        except sqlite3.OperationalError:
+            # Database not yet migrated by outreach_automation.py
+            pass
+        
         # Weekly summary
         cursor.execute("""
             SELECT 
@@ -299,7 +321,7 @@ def generate_html_report():
     if not db_stats:
         print("❌ Could not access database - generating limited report")
         db_stats = {
-            'total_targets': 0, 'targets_by_category': [], 'daily_stats': [],
+            'total_targets': 0, 'targets_by_category': [], 'daily_stats': [], 'weekly_trends': [],
             'weekly_summary': {'targets': 0, 'emails': 0, 'responses': 0},
             'monthly_summary': {'targets': 0, 'emails': 0, 'responses': 0},
             'recent_outreach': [], 'pending_targets': 0, 'contacted_targets': 0
@@ -647,7 +669,43 @@ def generate_html_report():
                     </tbody>
                 </table>
             </div>
-            
+"""
+
+    if db_stats['weekly_trends']:
+        html_content += """
+            <div class="table-container">
+                <h3 style="margin-bottom: 15px;">📅 Weekly Trends (Last 52 Weeks)</h3>
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Week Of</th>
+                            <th>New Targets</th>
+                            <th>Emails Sent</th>
+                            <th>Responses</th>
+                            <th>Total Targets</th>
+                            <th>GitHub Stars</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+"""
+        for week in db_stats['weekly_trends']:
+            html_content += f"""
+                        <tr>
+                            <td>{week[0]}</td>
+                            <td>{week[1]}</td>
+                            <td>{week[2]}</td>
+                            <td>{week[3]}</td>
+                            <td>{week[4]}</td>
+                            <td>{week[5]}</td>
+                        </tr>
+"""
+        html_content += """
+                    </tbody>
+                </table>
+            </div>
+"""
+
+    html_content += """
             <!-- Recent Outreach -->
 """
 
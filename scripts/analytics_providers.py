@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Open Build Analytics Providers
+Pluggable analytics sources (fetch, normalize, cache key, cost budget) and
+the engine that collects them concurrently with caching and quotas
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsProvider:
+    """One analytics source
+
+    Subclasses set `name` (the key of its section in the collected data),
+    `defaults` (the normalized shape, returned when nothing could be
+    fetched) and `cost` (quota units one fetch uses, counted against the
+    daily budget), and implement configured(), cache_key(), fetch() and
+    normalize(). fetch() returns the raw API response, or None when there
+    is nothing usable; normalize() maps it onto the keys of `defaults`.
+    """
+
+    name = ''
+    defaults: Dict = {}
+    cost = 1
+
+    def configured(self) -> bool:
+        return True
+
+    def cache_key(self) -> str:
+        return self.name
+
+    async def fetch(self, session: aiohttp.ClientSession) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def normalize(self, raw: Dict) -> Dict:
+        return raw
+
+
+class GoogleAnalyticsProvider(AnalyticsProvider):
+    """Website traffic; reports the zero defaults until the Google Analytics API is integrated"""
+
+    name = 'website'
+    defaults = {
+        'visitors': 0,
+        'page_views': 0,
+        'bounce_rate': 0,
+        'avg_session_duration': 0,
+        'top_pages': []
+    }
+
+    def __init__(self):
+        self.api_key = os.getenv('GOOGLE_ANALYTICS_API_KEY')
+        self.view_id = os.getenv('GOOGLE_ANALYTICS_VIEW_ID')
+
+    def configured(self) -> bool:
+        return bool(self.api_key and self.view_id)
+
+    def cache_key(self) -> str:
+        return f"website:{self.view_id}"
+
+    async def fetch(self, session: aiohttp.ClientSession) -> Optional[Dict]:
+        # Nothing to fetch until the Google Analytics API is integrated; the
+        # zero defaults apply (FakeProvider stands in for test figures)
+        return None
+
+
+class YouTubeProvider(AnalyticsProvider):
+    """Channel statistics from the YouTube Data API (channels.list costs 1 quota unit)"""
+
+    name = 'youtube'
+    defaults = {
+        'total_views': 0,
+        'subscribers': 0,
+        'total_videos': 0,
+        'recent_video_performance': [],
+        'top_performing_videos': []
+    }
+    API_URL = "https://www.googleapis.com/youtube/v3/channels"
+
+    def __init__(self):
+        self.api_key = os.getenv('YOUTUBE_API_KEY')
+        self.channel_id = os.getenv('YOUTUBE_CHANNEL_ID')
+
+    def configured(self) -> bool:
+        return bool(self.api_key and self.channel_id)
+
+    def cache_key(self) -> str:
+        return f"youtube:{self.channel_id}"
+
+    async def fetch(self, session: aiohttp.ClientSession) -> Optional[Dict]:
+        params = {'part': 'statistics', 'id': self.channel_id, 'key': self.api_key}
+        async with session.get(self.API_URL, params=params) as response:
+            if response.status != 200:
+                logger.warning(f"YouTube API returned {response.status}")
+                return None
+            data = await response.json()
+        items = data.get('items') or []
+        return items[0] if items else None
+
+    def normalize(self, raw: Dict) -> Dict:
+        statistics = raw.get('statistics', {})
+        return {
+            'total_views': int(statistics.get('viewCount', 0)),
+            'subscribers': int(statistics.get('subscriberCount', 0)),
+            'total_videos': int(statistics.get('videoCount', 0))
+        }
+
+
+class GitHubRepoProvider(AnalyticsProvider):
+    """Stars and forks of the project repository (public API, no auth needed)"""
+
+    name = 'social'
+    defaults = {
+        'twitter_followers': 0,
+        'linkedin_followers': 0,
+        'github_stars': 0,
+        'github_forks': 0,
+        'mentions': []
+    }
+
+    def __init__(self):
+        self.repo = os.getenv('GITHUB_REPO', 'open-build/website')
+
+    def configured(self) -> bool:
+        return bool(self.repo)
+
+    def cache_key(self) -> str:
+        return f"github:{self.repo}"
+
+    async def fetch(self, session: aiohttp.ClientSession) -> Optional[Dict]:
+        async with session.get(f"https://api.github.com/repos/{self.repo}") as response:
+            if response.status != 200:
+                logger.warning(f"GitHub API returned {response.status} for {self.repo}")
+                return None
+            return await response.json()
+
+    def normalize(self, raw: Dict) -> Dict:
+        return {
+            'github_stars': raw.get('stargazers_count', 0),
+            'github_forks': raw.get('forks_count', 0)
+        }
+
+
+class FakeProvider(AnalyticsProvider):
+    """Deterministic stand-in for a provider: fixed data after a fixed latency"""
+
+    def __init__(self, provider: AnalyticsProvider, data: Dict, latency: float = 0.0, cost: int = 1):
+        self.name = provider.name
+        self.defaults = provider.defaults
+        self.data = data
+        self.latency = latency
+        self.cost = cost
+        self.fetches = 0
+
+    def cache_key(self) -> str:
+        return f"fake:{self.name}"
+
+    async def fetch(self, session: aiohttp.ClientSession) -> Optional[Dict]:
+        self.fetches += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return dict(self.data)
+
+
+def default_providers() -> List[AnalyticsProvider]:
+    return [GoogleAnalyticsProvider(), YouTubeProvider(), GitHubRepoProvider()]
+
+
+def fake_providers(latency: float = 0.0) -> List[AnalyticsProvider]:
+    """Fakes of the three default providers, returning the same figures every time"""
+    return [
+        FakeProvider(GoogleAnalyticsProvider(), {
+            'visitors': 320, 'page_views': 910, 'bounce_rate': 52.5,
+            'avg_session_duration': 184.0, 'top_pages': ['/portfolio', '/services']
+        }, latency),
+        FakeProvider(YouTubeProvider(), {'total_views': 5400, 'subscribers': 210, 'total_videos': 24}, latency),
+        FakeProvider(GitHubRepoProvider(), {'github_stars': 42, 'github_forks': 7}, latency),
+    ]
+
+
+class AnalyticsEngine:
+    """Collects providers concurrently on one HTTP session
+
+    Normalized results are cached in analytics_cache for `ttl` seconds.
+    Each fetch charges the provider's cost to its budget for the day
+    (analytics_usage); once a budget is spent the provider serves its last
+    cached result, however old, or its defaults. Per-provider latency of
+    the last collection is kept in `latencies`.
+    """
+
+    def __init__(self, db_manager, providers: Iterable[AnalyticsProvider], ttl: float = 3600.0,
+                 budgets: Optional[Dict[str, int]] = None, timeout: float = 10.0):
+        self.db_manager = db_manager
+        self.providers = {provider.name: provider for provider in providers}
+        self.ttl = ttl
+        self.budgets = budgets or {}
+        self.timeout = timeout
+        self.latencies: Dict[str, float] = {}
+        db_manager.connections.register('analytics_cache_get', """
+            SELECT data, fetched_at FROM analytics_cache WHERE key = ?
+        """)
+        db_manager.connections.register('analytics_cache_put', """
+            INSERT OR REPLACE INTO analytics_cache (key, data, fetched_at) VALUES (?, ?, ?)
+        """)
+        db_manager.connections.register('analytics_usage_get', """
+            SELECT spent FROM analytics_usage WHERE provider = ? AND date = ?
+        """)
+        db_manager.connections.register('analytics_usage_add', """
+            INSERT INTO analytics_usage (provider, date, spent) VALUES (?, ?, ?)
+            ON CONFLICT(provider, date) DO UPDATE SET spent = spent + excluded.spent
+        """)
+
+    def _cache_get(self, key: str):
+        row = self.db_manager.execute('analytics_cache_get', (key,)).fetchone()
+        return (json.loads(row[0]), row[1]) if row else (None, None)
+
+    def _cache_put(self, key: str, data: Dict):
+        with self.db_manager.transaction():
+            self.db_manager.execute('analytics_cache_put', (key, json.dumps(data), time.time()))
+
+    def _charge(self, provider: AnalyticsProvider) -> bool:
+        """Reserve the provider's cost from today's budget; False if it would overspend"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        budget = self.budgets.get(provider.name)
+        with self.db_manager.transaction():
+            if budget is not None:
+                row = self.db_manager.execute('analytics_usage_get', (provider.name, today)).fetchone()
+                if (row[0] if row else 0) + provider.cost > budget:
+                    return False
+            self.db_manager.execute('analytics_usage_add', (provider.name, today, provider.cost))
+        return True
+
+    async def _collect(self, provider: AnalyticsProvider, session: aiohttp.ClientSession,
+                       use_cache: bool) -> Dict:
+        result = dict(provider.defaults)
+        if not provider.configured():
+            logger.warning(f"{provider.name} analytics not configured")
+            return result
+
+        aio = self.db_manager.aio
+        key = provider.cache_key()
+        cached, fetched_at = await aio.run(self._cache_get, key) if use_cache else (None, None)
+        if cached is not None and fetched_at >= time.time() - self.ttl:
+            logger.info(f"Using cached analytics for {key}")
+            result.update(cached)
+            return result
+
+        if not await aio.run(self._charge, provider):
+            logger.warning(f"{provider.name} analytics budget spent for today, using last known data")
+            result.update(cached or {})
+            return result
+
+        started = time.perf_counter()
+        try:
+            raw = await provider.fetch(session)
+        except Exception as e:
+            logger.error(f"Error collecting {provider.name} analytics: {e}")
+            raw = None
+        finally:
+            self.latencies[provider.name] = time.perf_counter() - started
+        if raw is None:
+            return result
+
+        data = provider.normalize(raw)
+        await aio.run(self._cache_put, key, data)
+        result.update(data)
+        return result
+
+    async def collect(self, names: Optional[Iterable[str]] = None,
+                      session: Optional[aiohttp.ClientSession] = None, use_cache: bool = True) -> Dict[str, Dict]:
+        """Normalized data per provider name, collected concurrently"""
+        providers = [self.providers[name] for name in (names or self.providers)]
+        if session is None:
+            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
+                return await self.collect(names, session, use_cache)
+        results = await asyncio.gather(*(self._collect(provider, session, use_cache) for provider in providers))
+        return {provider.name: result for provider, result in zip(providers, results)}
@@ -8,6 +8,7 @@ Connects to Ollama service to generate daily technical articles
 """
 
 import os
+import sys
 import json
 import requests
 import sqlite3
@@ -28,6 +29,52 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+sys.path.append(str(Path(__file__).parent))
+from schema_migrations import apply_migrations
+
+# Numbered schema migrations for blog_articles.db; append new versions only
+SCHEMA_MIGRATIONS = [
+    # 1: Article tracking and learning tables
+    [
+        # Articles table
+        """
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT UNIQUE NOT NULL,
+            title TEXT NOT NULL,
+            category TEXT NOT NULL,
+            business_use_case TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            performance_score REAL DEFAULT 0,
+            feedback_count INTEGER DEFAULT 0,
+            created_at TEXT NOT NULL,
+            published BOOLEAN DEFAULT FALSE
+        )
+        """,
+        # Learning feedback table
+        """
+        CREATE TABLE IF NOT EXISTS article_feedback (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            article_id INTEGER,
+            feedback_type TEXT,
+            feedback_data TEXT,
+            created_at TEXT,
+            FOREIGN KEY (article_id) REFERENCES articles (id)
+        )
+        """,
+        # Generation prompts evolution table
+        """
+        CREATE TABLE IF NOT EXISTS prompt_evolution (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            prompt_version TEXT NOT NULL,
+            prompt_content TEXT NOT NULL,
+            performance_metrics TEXT,
+            created_at TEXT NOT NULL
+        )
+        """,
+    ],
+]
+
 class BlogArticleGenerator:
     def __init__(self):
         # Configuration from environment
@@ -86,52 +133,12 @@ class BlogArticleGenerator:
         ]
 
     def init_database(self):
-        """Initialize SQLite database for article tracking and learning"""
+        """Bring the article tracking database up to the latest schema version"""
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Articles table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS articles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date TEXT UNIQUE NOT NULL,
-                title TEXT NOT NULL,
-                category TEXT NOT NULL,
-                business_use_case TEXT NOT NULL,
-                content_hash TEXT NOT NULL,
-                performance_score REAL DEFAULT 0,
-                feedback_count INTEGER DEFAULT 0,
-                created_at TEXT NOT NULL,
-                published BOOLEAN DEFAULT FALSE
-            )
-        """)
-        
-        # Learning feedback table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS article_feedback (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                article_id INTEGER,
-                feedback_type TEXT,
-                feedback_data TEXT,
-                created_at TEXT,
-                FOREIGN KEY (article_id) REFERENCES articles (id)
-            )
-        """)
-        
-        # Generation prompts evolution table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS prompt_evolution (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                prompt_version TEXT NOT NULL,
-                prompt_content TEXT NOT NULL,
-                performance_metrics TEXT,
-                created_at TEXT NOT NULL
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
-        logger.info("Database initialized successfully")
+        try:
+            apply_migrations(conn, SCHEMA_MIGRATIONS)
+        finally:
+            conn.close()
 
     def load_reference_content(self):
         """Load reference content from buildly.io and radicaltherapy.dev"""
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Open Build Contact Extractor
+Single-pass, streaming extraction of emails, mailto links, page title,
+role/name pairs and outbound links from raw HTML bytes
+"""
+
+import re
+import html
+import functools
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+from contact_rules import ContactRules, trie_pattern
+
+DEFAULT_CONTACT_RULES = ContactRules()
+
+
+@functools.lru_cache(maxsize=None)
+def contact_pattern(role_keywords: Tuple[str, ...]) -> re.Pattern:
+    """The combined single-pass pattern for a set of role keywords
+
+    Every alternative is length-bounded so a match never spans more than
+    ContactExtractor.OVERLAP bytes; that is what makes chunked scanning exact.
+    """
+    roles = trie_pattern(sorted(keyword[:64] for keyword in role_keywords)).encode('utf-8')
+    return re.compile(
+        rb'(?i:mailto:)(?P<mailto>[^"\'?<>\s]{1,320})'
+        rb'|(?i:<title)[^>]{0,200}>(?P<title>[^<]{1,300})(?i:</title>)'
+        rb'|\b(?P<role>(?i:' + roles + rb'))[:\s]{1,10}(?P<name>[A-Z][a-z]{1,30} [A-Z][a-z]{1,30})\b'
+        rb'|\b(?P<email>[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,253}\.[A-Za-z]{2,24})\b'
+        rb'|(?P<link>https?://[A-Za-z0-9.-]{1,253}\.[A-Za-z]{2,24}(?:/[^\s"\'<>]{0,2000})?)'
+    )
+
+
+EMAIL_PATTERN = re.compile(r'[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,253}\.[A-Za-z]{2,24}')
+
+
+@dataclass
+class PageContacts:
+    """Everything the discovery pipeline needs from one page"""
+    title: str = ""
+    emails: List[str] = field(default_factory=list)  # mailto addresses first
+    names: List[str] = field(default_factory=list)
+    roles: List[str] = field(default_factory=list)  # role matched for each name
+    links: List[str] = field(default_factory=list)
+    bytes_scanned: int = 0
+    unchanged: bool = False  # Same content as the last crawl (or a mirror of another page)
+    duplicate_of: str = ""
+
+    def as_contact_info(self) -> Dict[str, List[str]]:
+        return {'emails': self.emails, 'names': self.names, 'roles': self.roles}
+
+
+class ContactExtractor:
+    """Incremental scanner fed with body chunks as they arrive
+
+    Only a window of SCAN_SIZE bytes plus an OVERLAP tail is held at a time,
+    and each byte is matched against one combined pattern, so memory stays
+    flat however large the page is.
+    """
+
+    SCAN_SIZE = 64 * 1024
+    OVERLAP = 4096  # Longer than the longest possible match
+
+    def __init__(self, rules: Optional[ContactRules] = None, max_links: int = 500):
+        self.rules = rules or DEFAULT_CONTACT_RULES
+        self.max_links = max_links
+        self._pattern = contact_pattern(tuple(self.rules.role_keywords))
+        self._buffer = b''
+        self._bytes = 0
+        self._title: Optional[bytes] = None
+        self._mailto: Dict[str, None] = {}
+        self._emails: Dict[str, None] = {}
+        self._names: Dict[str, str] = {}
+        self._links: Dict[str, None] = {}
+
+    def feed(self, chunk: bytes):
+        self._bytes += len(chunk)
+        self._buffer += chunk
+        if len(self._buffer) >= self.SCAN_SIZE:
+            self._scan(final=False)
+
+    def _scan(self, final: bool):
+        buffer = self._buffer
+        safe = len(buffer) if final else len(buffer) - self.OVERLAP
+        keep_from = safe
+        for match in self._pattern.finditer(buffer):
+            if match.end() >= safe and not final:
+                # Might still grow with the next chunk; rescan it then
+                keep_from = min(match.start(), safe)
+                break
+            self._record(match)
+        self._buffer = buffer[keep_from:]
+
+    def _record(self, match: re.Match):
+        kind = match.lastgroup
+        if kind == 'email':
+            self._emails.setdefault(match.group('email').decode('ascii').lower())
+        elif kind == 'link':
+            if len(self._links) < self.max_links:
+                self._links.setdefault(match.group('link').decode('ascii', errors='replace'))
+        elif kind == 'mailto':
+            address = unquote(match.group('mailto').decode('ascii', errors='replace'))
+            if EMAIL_PATTERN.fullmatch(address):
+                self._mailto.setdefault(address.lower())
+        elif kind == 'name':
+            self._names.setdefault(match.group('name').decode('ascii'),
+                                   match.group('role').decode('ascii'))
+        elif kind == 'title' and self._title is None:
+            self._title = match.group('title')
+
+    def finish(self, charset: str = 'utf-8') -> PageContacts:
+        """Scan whatever is still buffered and return the results"""
+        self._scan(final=True)
+
+        title = ""
+        if self._title is not None:
+            try:
+                title = self._title.decode(charset, errors='replace')
+            except LookupError:
+                title = self._title.decode('utf-8', errors='replace')
+            title = ' '.join(html.unescape(title).split())
+
+        emails = [email for email in {**self._mailto, **self._emails}
+                  if not self.rules.skip_emails.search(email)]
+        return PageContacts(
+            title=title,
+            emails=emails,
+            names=list(self._names),
+            roles=list(self._names.values()),
+            links=list(self._links),
+            bytes_scanned=self._bytes,
+        )
+
+
+def extract_contacts(document: str, rules: Optional[ContactRules] = None) -> PageContacts:
+    """Run the extractor over an already-decoded document"""
+    extractor = ContactExtractor(rules)
+    extractor.feed(document.encode('utf-8', errors='replace'))
+    return extractor.finish()
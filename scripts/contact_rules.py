@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Open Build Contact Rules
+Configurable discovery heuristics (email skip patterns, contact role
+keywords, domain blocklist, business indicators) compiled once into
+matchers whose cost doesn't grow with the number of entries
+"""
+
+import re
+from typing import Dict, Iterable, Optional
+
+DEFAULT_RULES = {
+    # Substrings marking emails that are never useful outreach contacts
+    'skip_email_patterns': ['noreply', 'no-reply', 'donotreply', 'support', 'info@example'],
+    # Keywords introducing a named contact ("CEO: Jane Doe")
+    'role_keywords': ['CEO', 'Founder', 'Contact'],
+    # Domains (and all their subdomains) that are never targets
+    'skip_domains': ['google.com', 'facebook.com', 'twitter.com', 'linkedin.com'],
+    # Substrings of a domain that suggest a business
+    'business_indicators': ['startup', 'company', 'corp', 'inc', 'llc', 'ltd'],
+}
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """Regex source matching any of the words, with shared prefixes factored
+
+    The alternation follows a character trie, so at each position the regex
+    engine walks one branch per character instead of retrying every word;
+    matching cost stays flat as the word list grows.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        if not word:
+            continue
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # A word ending here makes the rest optional (greedy, so longest wins)
+        return f"(?:{body})?" if '' in node else body
+
+    return build(trie) or '(?!)'
+
+
+class KeywordMatcher:
+    """Case-insensitive substring matcher over a fixed keyword set"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = sorted({keyword.lower() for keyword in keywords if keyword})
+        self._pattern = re.compile(trie_pattern(self.keywords), re.IGNORECASE)
+
+    def search(self, text: str) -> bool:
+        return self._pattern.search(text) is not None
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+
+class DomainBlocklist:
+    """Blocklist of domains that also blocks every subdomain
+
+    Entries are indexed by their full name, so a lookup costs one set probe
+    per label of the host (a.b.example.com checks four suffixes) however
+    many domains are listed.
+    """
+
+    def __init__(self, domains: Iterable[str]):
+        self._domains = {domain.lower().strip('.') for domain in domains if domain}
+
+    def blocks(self, host: str) -> bool:
+        labels = host.lower().rsplit('@', 1)[-1].split(':', 1)[0].strip('.').split('.')
+        return any('.'.join(labels[i:]) in self._domains for i in range(len(labels)))
+
+    def __len__(self) -> int:
+        return len(self._domains)
+
+
+class ContactRules:
+    """Compiled form of the "contact_rules" section of config.json"""
+
+    def __init__(self, rules: Optional[Dict] = None):
+        rules = {**DEFAULT_RULES, **(rules or {})}
+        self.role_keywords = list(rules['role_keywords'])
+        self.skip_emails = KeywordMatcher(rules['skip_email_patterns'])
+        self.skip_domains = DomainBlocklist(rules['skip_domains'])
+        self.business_indicators = KeywordMatcher(rules['business_indicators'])
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'ContactRules':
+        return cls(config.get('contact_rules'))
+
+    def is_potential_target(self, host: str) -> bool:
+        """Not blocklisted and the domain suggests a business"""
+        return not self.skip_domains.blocks(host) and self.business_indicators.search(host)
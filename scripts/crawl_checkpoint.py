@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Open Build Crawl Checkpoints
+Incremental persistence of a discovery crawl (frontier queue, visited set,
+per-source progress and results) so an interrupted run can be resumed
+"""
+
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (canonical key, url to fetch, meta) for a newly queued URL
+QueuedUrl = Tuple[str, str, Dict]
+
+
+class CrawlCheckpoint:
+    """Discovery run state kept in the discovery_runs/_frontier/_results tables
+
+    Every frontier URL is a row (the visited set); rows not yet marked done
+    are the queue. Each handled page is committed together with the URLs it
+    queued and the results it produced, so a crash loses at most the pages
+    in flight. Rows carry the seed source they descend from, giving the
+    per-source progress. Methods run on the database thread (db_manager.aio).
+    """
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.run_id: Optional[int] = None
+        db_manager.connections.register('checkpoint_queue', """
+            INSERT OR IGNORE INTO discovery_frontier (run_id, url_key, url, meta, source)
+            VALUES (?, ?, ?, ?, ?)
+        """)
+        db_manager.connections.register('checkpoint_done', """
+            UPDATE discovery_frontier SET done = 1 WHERE run_id = ? AND url_key = ?
+        """)
+        db_manager.connections.register('checkpoint_result', """
+            INSERT INTO discovery_results (run_id, result) VALUES (?, ?)
+        """)
+
+    def begin(self, resume: bool = False) -> bool:
+        """Start a run, or continue the latest unfinished one when resume is set
+
+        Returns True when an earlier run is being resumed. Unfinished runs
+        that are not resumed are marked abandoned and their state dropped.
+        """
+        unfinished = [run_id for (run_id,) in self.db_manager.execute(
+            "SELECT id FROM discovery_runs WHERE status = 'running' ORDER BY id")]
+        if resume and unfinished:
+            self.run_id = unfinished[-1]
+            return True
+        if resume:
+            logger.info("No interrupted discovery run to resume, starting a new one")
+
+        with self.db_manager.transaction():
+            self._discard(unfinished, 'abandoned')
+            cursor = self.db_manager.execute(
+                "INSERT INTO discovery_runs (started_at, status) VALUES (?, 'running')",
+                (datetime.now().isoformat(),))
+        self.run_id = cursor.lastrowid
+        return False
+
+    def _discard(self, run_ids: List[int], status: str):
+        for run_id in run_ids:
+            self.db_manager.execute("DELETE FROM discovery_frontier WHERE run_id = ?", (run_id,))
+            self.db_manager.execute("DELETE FROM discovery_results WHERE run_id = ?", (run_id,))
+            self.db_manager.execute("""
+                UPDATE discovery_runs SET status = ?, finished_at = ? WHERE id = ?
+            """, (status, datetime.now().isoformat(), run_id))
+
+    def load(self) -> Tuple[List[Tuple[str, str, Dict, bool]], List[Dict]]:
+        """Saved frontier rows (key, url, meta, done) and results of this run"""
+        rows = [(key, url, json.loads(meta), bool(done)) for key, url, meta, done in self.db_manager.execute("""
+            SELECT url_key, url, meta, done FROM discovery_frontier WHERE run_id = ? ORDER BY rowid
+        """, (self.run_id,))]
+        results = [json.loads(result) for (result,) in self.db_manager.execute(
+            "SELECT result FROM discovery_results WHERE run_id = ? ORDER BY id", (self.run_id,))]
+        return rows, results
+
+    def source_progress(self) -> Dict[str, Tuple[int, int]]:
+        """Pages done and total queued per seed source"""
+        return {source: (done, total) for source, done, total in self.db_manager.execute("""
+            SELECT source, SUM(done), COUNT(*) FROM discovery_frontier WHERE run_id = ? GROUP BY source
+        """, (self.run_id,))}
+
+    def record(self, done_key: Optional[str], queued: List[QueuedUrl], results: List[Dict]):
+        """Atomically mark a page handled along with what it queued and produced"""
+        with self.db_manager.transaction():
+            self.db_manager.connections.executemany('checkpoint_queue', [
+                (self.run_id, key, url, json.dumps(meta), meta.get('source', url))
+                for key, url, meta in queued
+            ])
+            if done_key is not None:
+                self.db_manager.execute('checkpoint_done', (self.run_id, done_key))
+            self.db_manager.connections.executemany('checkpoint_result', [
+                (self.run_id, json.dumps(result)) for result in results
+            ])
+
+    def finish(self):
+        """Mark the run complete and drop its frontier state"""
+        with self.db_manager.transaction():
+            self._discard([self.run_id], 'complete')
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Open Build GitHub Discovery
+Finds organizations behind popular developer-education repositories via the
+GitHub search API, paging through results on one shared session and
+fetching organization profiles concurrently within the API rate limit
+"""
+
+import os
+import re
+import json
+import time
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from http_cache import HttpCache, FetchResult
+
+logger = logging.getLogger(__name__)
+
+API_ROOT = "https://api.github.com"
+DEFAULT_QUERIES = [
+    'developer+education+organization',
+    'coding+bootcamp+company',
+    'programming+course+business',
+]
+
+NEXT_LINK_PATTERN = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+
+@dataclass
+class GitHubOrg:
+    """Public profile fields of an organization used for outreach"""
+    login: str
+    name: str
+    email: str
+    blog: str
+
+
+class RateBudget:
+    """Client-side view of GitHub's per-resource rate limits
+
+    Updated from the X-RateLimit-* headers of every response. acquire()
+    reserves one request, waiting for the window reset when the remaining
+    budget is down to `reserve` (if the reset is within max_wait) and
+    returning False otherwise so callers stop instead of getting 403s.
+    """
+
+    def __init__(self, reserve: int = 2, max_wait: float = 90.0):
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self._remaining: Dict[str, int] = {}
+        self._reset_at: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    def update(self, resource: str, headers):
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset_at = headers.get('X-RateLimit-Reset')
+        resource = headers.get('X-RateLimit-Resource', resource)
+        if remaining is not None and reset_at is not None:
+            self._remaining[resource] = int(remaining)
+            self._reset_at[resource] = float(reset_at)
+
+    async def acquire(self, resource: str) -> bool:
+        async with self._lock:
+            remaining = self._remaining.get(resource)
+            if remaining is not None and remaining <= self.reserve:
+                wait = self._reset_at.get(resource, 0) - time.time()
+                if wait > self.max_wait:
+                    return False
+                if wait > 0:
+                    logger.info(f"GitHub {resource} rate limit reached, waiting {wait:.0f}s for reset")
+                    await asyncio.sleep(wait)
+                self._remaining.pop(resource, None)
+            elif remaining is not None:
+                # Optimistic decrement until the response reports the real value
+                self._remaining[resource] = remaining - 1
+            return True
+
+
+class GitHubDiscovery:
+    """Search repositories and resolve their owning organizations
+
+    Organization profiles are fetched at most once per run (concurrent
+    lookups of one login share a task) and kept in the github_orgs table for
+    org_cache_days, so later runs and other queries reuse them without an
+    API call. Only organizations publishing a contact email are returned.
+    """
+
+    def __init__(self, db_manager, http_cache: HttpCache, config: Optional[Dict] = None):
+        config = config or {}
+        self.db_manager = db_manager
+        self.http_cache = http_cache
+        self.queries = config.get('queries', DEFAULT_QUERIES)
+        self.max_pages = config.get('max_pages', 2)
+        self.per_page = config.get('per_page', 30)
+        self.max_concurrent = config.get('max_concurrent', 5)
+        self.org_cache_seconds = config.get('org_cache_days', 7) * 24 * 3600
+        self.token = os.getenv('GITHUB_TOKEN')
+        self.budget = RateBudget()
+        self.api_requests = 0
+        self._orgs: Dict[str, asyncio.Future] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        db_manager.connections.register('github_org_get', """
+            SELECT name, email, blog, fetched_at FROM github_orgs WHERE login = ?
+        """)
+        db_manager.connections.register('github_org_put', """
+            INSERT OR REPLACE INTO github_orgs (login, name, email, blog, fetched_at)
+            VALUES (?, ?, ?, ?, ?)
+        """)
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {'Accept': 'application/vnd.github+json'}
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
+        return headers
+
+    async def _get(self, session: aiohttp.ClientSession, url: str, resource: str) -> Optional[FetchResult]:
+        if not await self.budget.acquire(resource):
+            logger.warning(f"GitHub {resource} budget exhausted, skipping {url}")
+            return None
+        # Conditional requests answered 304 don't count against the rate limit
+        result = await self.http_cache.fetch(session, url, headers=self._headers())
+        self.api_requests += 1
+        self.budget.update(resource, result.headers)
+        if result.status != 200:
+            logger.warning(f"GitHub API returned {result.status} for {url}")
+            return None
+        return result
+
+    async def search(self, session: aiohttp.ClientSession, query: str) -> List[Dict]:
+        """Organization-owned repositories for a query, following pagination"""
+        url = f"{API_ROOT}/search/repositories?q={query}&sort=stars&order=desc&per_page={self.per_page}"
+        repos = []
+        for _ in range(self.max_pages):
+            result = await self._get(session, url, 'search')
+            if result is None:
+                break
+            repos.extend(repo for repo in json.loads(result.body).get('items', [])
+                         if repo.get('owner', {}).get('type') == 'Organization')
+            next_link = NEXT_LINK_PATTERN.search(result.headers.get('Link', ''))
+            if not next_link:
+                break
+            url = next_link.group(1)
+        return repos
+
+    def _load_org(self, login: str) -> Optional[GitHubOrg]:
+        row = self.db_manager.execute('github_org_get', (login,)).fetchone()
+        if row and row[3] > time.time() - self.org_cache_seconds:
+            return GitHubOrg(login, row[0] or "", row[1] or "", row[2] or "")
+        return None
+
+    def _store_org(self, org: GitHubOrg):
+        with self.db_manager.transaction():
+            self.db_manager.execute('github_org_put', (org.login, org.name, org.email, org.blog, time.time()))
+
+    async def _fetch_org(self, session: aiohttp.ClientSession, login: str) -> Optional[GitHubOrg]:
+        org = await self.db_manager.aio.run(self._load_org, login)
+        if org:
+            return org
+
+        async with self._semaphore:
+            result = await self._get(session, f"{API_ROOT}/orgs/{login}", 'core')
+        if result is None:
+            return None
+
+        data = json.loads(result.body)
+        org = GitHubOrg(login, data.get('name') or "", data.get('email') or "", data.get('blog') or "")
+        await self.db_manager.aio.run(self._store_org, org)
+        return org
+
+    def org(self, session: aiohttp.ClientSession, login: str) -> asyncio.Future:
+        """Organization profile by login, looked up once per run"""
+        key = login.lower()
+        if key not in self._orgs:
+            self._orgs[key] = asyncio.ensure_future(self._fetch_org(session, login))
+        return self._orgs[key]
+
+    async def discover(self) -> List[Dict]:
+        """Run every query and return one candidate per organization with an email
+
+        Each candidate is the org's most-starred matching repository:
+        {'org': GitHubOrg, 'repo': repo search item}.
+        """
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        timeout = aiohttp.ClientTimeout(total=30)
+        candidates: Dict[str, Dict] = {}
+
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            for query in self.queries:
+                repos = await self.search(session, query)
+                # Owners resolve concurrently; each login is fetched once
+                orgs = await asyncio.gather(*(self.org(session, repo['owner']['login']) for repo in repos),
+                                            return_exceptions=True)
+                for repo, org in zip(repos, orgs):
+                    if isinstance(org, Exception):
+                        logger.error(f"Error fetching GitHub org {repo['owner']['login']}: {org}")
+                        continue
+                    if not org or not org.email:
+                        continue
+                    best = candidates.get(org.login.lower())
+                    if best is None or repo['stargazers_count'] > best['repo']['stargazers_count']:
+                        candidates[org.login.lower()] = {'org': org, 'repo': repo}
+
+        logger.info(f"GitHub discovery: {len(self._orgs)} organizations checked, "
+                    f"{len(candidates)} with a public email, {self.api_requests} API requests")
+        return list(candidates.values())
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Open Build HTTP Response Cache
+On-disk, size-bounded LRU cache of HTTP responses that revalidates entries
+with conditional GETs (If-None-Match / If-Modified-Since)
+"""
+
+import time
+import zlib
+import sqlite3
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+import aiohttp
+
+from schema_migrations import apply_migrations
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_MIGRATIONS = [
+    # 1: Cached responses with validators and LRU bookkeeping
+    [
+        """
+        CREATE TABLE IF NOT EXISTS http_responses (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            content_type TEXT,
+            body BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            fetched_at REAL NOT NULL,
+            last_access REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_http_responses_last_access ON http_responses (last_access)",
+    ],
+]
+
+
+@dataclass
+class CachedEntry:
+    """A stored response body plus the validators needed to revalidate it"""
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_type: Optional[str]
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a (possibly conditional) GET"""
+    status: int
+    body: bytes
+    headers: Mapping[str, str]
+    content_type: Optional[str] = None
+    from_cache: bool = False
+    truncated: bool = False
+
+    @property
+    def charset(self) -> str:
+        if self.content_type and 'charset=' in self.content_type:
+            return self.content_type.split('charset=', 1)[1].split(';')[0].strip().strip('"') or 'utf-8'
+        return 'utf-8'
+
+    def text(self) -> str:
+        try:
+            return self.body.decode(self.charset, errors='replace')
+        except LookupError:
+            return self.body.decode('utf-8', errors='replace')
+
+
+async def read_body(response: aiohttp.ClientResponse, on_chunk: Optional[Callable[[bytes], None]] = None,
+                    max_bytes: Optional[int] = None, keep: bool = True) -> Tuple[bytes, bool]:
+    """Read a response body chunk by chunk, stopping at max_bytes
+
+    Each chunk is handed to on_chunk as it arrives; the body is only
+    accumulated when keep is set. Returns (body, truncated).
+    """
+    chunks = []
+    received = 0
+    truncated = False
+    async for chunk in response.content.iter_chunked(64 * 1024):
+        if max_bytes is not None and received + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - received]
+            truncated = True
+        received += len(chunk)
+        if on_chunk:
+            on_chunk(chunk)
+        if keep:
+            chunks.append(chunk)
+        if truncated:
+            break
+    return b''.join(chunks), truncated
+
+
+class HttpCache:
+    """Validator-aware response cache stored in its own SQLite file
+
+    Only responses carrying an ETag or Last-Modified (and no
+    Cache-Control: no-store) are kept, compressed with zlib. When the stored
+    bytes exceed max_bytes the least recently used entries are evicted.
+    """
+
+    def __init__(self, db_path: str = "http_cache.db", max_bytes: int = 256 * 1024 * 1024):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.revalidated = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Accessed from worker threads via asyncio.to_thread, serialized by _lock
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            apply_migrations(self._conn, SCHEMA_MIGRATIONS)
+            self._total_bytes = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM http_responses").fetchone()[0]
+        return self._conn
+
+    def lookup(self, url: str) -> Optional[CachedEntry]:
+        """Return the stored entry for a URL, if any"""
+        with self._lock:
+            row = self._connection().execute("""
+                SELECT body, etag, last_modified, content_type FROM http_responses WHERE url = ?
+            """, (url,)).fetchone()
+        if row is None:
+            return None
+        return CachedEntry(zlib.decompress(row[0]), row[1], row[2], row[3])
+
+    def store(self, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str],
+              content_type: Optional[str]):
+        """Store (or replace) a response and evict LRU entries over the size bound"""
+        compressed = zlib.compress(body, 6)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            previous = conn.execute("SELECT size FROM http_responses WHERE url = ?", (url,)).fetchone()
+            conn.execute("""
+                INSERT OR REPLACE INTO http_responses
+                (url, etag, last_modified, content_type, body, size, fetched_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (url, etag, last_modified, content_type, compressed, len(compressed), now, now))
+            self._total_bytes += len(compressed) - (previous[0] if previous else 0)
+            self._evict(conn)
+            conn.commit()
+
+    def touch(self, url: str):
+        """Mark an entry as freshly validated and recently used"""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("UPDATE http_responses SET fetched_at = ?, last_access = ? WHERE url = ?",
+                         (now, now, url))
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection):
+        while self._total_bytes > self.max_bytes:
+            victims = conn.execute("""
+                SELECT url, size FROM http_responses ORDER BY last_access LIMIT 100
+            """).fetchall()
+            if not victims:
+                self._total_bytes = 0
+                return
+            for url, size in victims:
+                conn.execute("DELETE FROM http_responses WHERE url = ?", (url,))
+                self._total_bytes -= size
+                if self._total_bytes <= self.max_bytes:
+                    break
+
+    async def fetch(self, session: aiohttp.ClientSession, url: str,
+                    headers: Optional[Dict[str, str]] = None,
+                    on_chunk: Optional[Callable[[bytes], None]] = None,
+                    max_bytes: Optional[int] = None) -> FetchResult:
+        """GET a URL, revalidating any cached copy; a 304 yields the cached body as 200
+
+        With on_chunk, a 200 body from the network is streamed to it (capped
+        at max_bytes) and only buffered when it is going to be stored. Bodies
+        served from the cache (from_cache=True) are not streamed, so callers
+        can tell an unchanged page apart and skip it.
+        """
+        entry = await asyncio.to_thread(self.lookup, url)
+        request_headers = dict(headers or {})
+        if entry:
+            if entry.etag:
+                request_headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                request_headers['If-Modified-Since'] = entry.last_modified
+
+        async with session.get(url, headers=request_headers) as response:
+            response_headers = response.headers.copy()  # Case-insensitive
+            if response.status == 304 and entry:
+                self.revalidated += 1
+                await asyncio.to_thread(self.touch, url)
+                body, truncated = entry.body, False
+                if max_bytes is not None and len(body) > max_bytes:
+                    body, truncated = body[:max_bytes], True
+                return FetchResult(200, body, response_headers, entry.content_type,
+                                   from_cache=True, truncated=truncated)
+
+            etag = response_headers.get('ETag')
+            last_modified = response_headers.get('Last-Modified')
+            no_store = 'no-store' in response_headers.get('Cache-Control', '').lower()
+            cacheable = response.status == 200 and bool(etag or last_modified) and not no_store
+            streaming = on_chunk if response.status == 200 else None
+            body, truncated = await read_body(response, streaming, max_bytes,
+                                              keep=cacheable or streaming is None)
+            content_type = response.headers.get('Content-Type')
+
+        self.misses += 1
+        if cacheable and not truncated:
+            await asyncio.to_thread(self.store, url, body, etag, last_modified, content_type)
+
+        return FetchResult(response.status, body, response_headers, content_type, truncated=truncated)
+
+    def close(self):
+        if self._conn is not None:
+            logger.info(f"HTTP cache: {self.revalidated} revalidated (304), {self.misses} full fetches, "
+                        f"{self._total_bytes / 1024 / 1024:.1f}MB stored")
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Open Build Email Outbox
+Durable queue of rendered outreach emails, the scheduler that assigns
+their send times and the asyncio worker that delivers them concurrently,
+retrying failures with exponential backoff
+"""
+
+import time
+import bisect
+import random
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutboxMessage:
+    """A queued email as stored in the outbox table"""
+    id: int
+    target_id: Optional[int]
+    target_url: str
+    to_email: str
+    subject: str
+    body: str
+    attempts: int
+    outreach_log_id: Optional[int]
+
+
+class Outbox:
+    """Outbox table access; every method runs on the database thread
+
+    Enqueuing also writes a 'queued' outreach_log row, which becomes
+    'delivered' (and bumps the target's contact status) once the message is
+    accepted by the SMTP server, or 'failed' after max_attempts tries.
+    """
+
+    COLUMNS = "id, target_id, target_url, to_email, subject, body, attempts, outreach_log_id"
+
+    def __init__(self, db_manager, max_attempts: int = 5, retry_backoff: float = 60.0):
+        self.db_manager = db_manager
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        db_manager.connections.register('outbox_insert', """
+            INSERT INTO outbox
+            (target_id, target_url, outreach_log_id, to_email, subject, body, next_attempt_at, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """)
+        db_manager.connections.register('outbox_due', f"""
+            SELECT {self.COLUMNS} FROM outbox
+            WHERE status = 'queued' AND next_attempt_at <= ?
+            ORDER BY next_attempt_at, id
+            LIMIT ?
+        """)
+        db_manager.connections.register('outbox_set_status', """
+            UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?, sent_at = ?
+            WHERE id = ?
+        """)
+        db_manager.connections.register('outreach_log_status', """
+            UPDATE outreach_log SET status = ?, email_sent = ? WHERE id = ?
+        """)
+
+    def enqueue(self, target_id: Optional[int], target_url: str, to_email: str, subject: str, body: str,
+                template: str = 'automated_outreach', send_at: Optional[float] = None) -> int:
+        """Queue a rendered message for delivery at send_at (default: now)"""
+        now = datetime.now().isoformat()
+        with self.db_manager.transaction():
+            log_id = self.db_manager.execute('insert_outreach_log',
+                                             (target_id, subject, template, 'queued', now)).lastrowid
+            return self.db_manager.execute('outbox_insert', (
+                target_id, target_url, log_id, to_email, subject, body, send_at or time.time(), now
+            )).lastrowid
+
+    def pending_target_ids(self) -> Set[int]:
+        """Targets that already have a message waiting to go out"""
+        return {target_id for (target_id,) in self.db_manager.execute(
+            "SELECT target_id FROM outbox WHERE status IN ('queued', 'sending') AND target_id IS NOT NULL")}
+
+    def queued_summary(self) -> Tuple[int, Optional[float]]:
+        """(messages waiting to go out, send time of the last of them)"""
+        count, last_due = self.db_manager.execute(
+            "SELECT COUNT(*), MAX(next_attempt_at) FROM outbox WHERE status IN ('queued', 'sending')").fetchone()
+        return count, last_due
+
+    def count_sent_since(self, sent_after: str) -> int:
+        """Messages delivered after the given ISO timestamp"""
+        return self.db_manager.execute(
+            "SELECT COUNT(*) FROM outbox WHERE status = 'sent' AND sent_at >= ?", (sent_after,)).fetchone()[0]
+
+    def recover(self) -> int:
+        """Requeue messages left mid-send by an interrupted run"""
+        with self.db_manager.transaction():
+            return self.db_manager.execute(
+                "UPDATE outbox SET status = 'queued' WHERE status = 'sending'").rowcount
+
+    def claim_due(self, limit: int) -> List[OutboxMessage]:
+        """Take up to `limit` due messages, marking them as being sent"""
+        with self.db_manager.transaction():
+            messages = [OutboxMessage(*row) for row in
+                        self.db_manager.execute('outbox_due', (time.time(), limit)).fetchall()]
+            self.db_manager.connections.executemany(
+                "UPDATE outbox SET status = 'sending' WHERE id = ?", [(m.id,) for m in messages])
+        return messages
+
+    def next_due_at(self) -> Optional[float]:
+        return self.db_manager.execute(
+            "SELECT MIN(next_attempt_at) FROM outbox WHERE status = 'queued'").fetchone()[0]
+
+    def mark_sent(self, message: OutboxMessage):
+        now = datetime.now().isoformat()
+        with self.db_manager.transaction():
+            # next_attempt_at keeps the actual send time for the scheduler's spacing
+            self.db_manager.execute('outbox_set_status',
+                                    ('sent', message.attempts + 1, time.time(), None, now, message.id))
+            if message.outreach_log_id is not None:
+                self.db_manager.execute('outreach_log_status', ('delivered', now, message.outreach_log_id))
+            self.db_manager.execute('update_contact_status', (now, now, message.target_url))
+
+    def mark_failed(self, message: OutboxMessage, error: str) -> bool:
+        """Record a failed attempt; returns True if the message will be retried"""
+        attempts = message.attempts + 1
+        retry = attempts < self.max_attempts
+        # 1x, 2x, 4x ... the base backoff, with jitter so retries don't bunch up
+        next_attempt = time.time() + self.retry_backoff * 2 ** (attempts - 1) * random.uniform(1.0, 1.25)
+        with self.db_manager.transaction():
+            self.db_manager.execute('outbox_set_status', (
+                'queued' if retry else 'failed', attempts, next_attempt, error[:500], None, message.id
+            ))
+            if not retry and message.outreach_log_id is not None:
+                self.db_manager.execute('outreach_log_status', ('failed', None, message.outreach_log_id))
+        return retry
+
+    def scheduled_sends(self, since: float) -> List[Tuple[str, float]]:
+        """(recipient, send time) of messages sent or still to send after `since`"""
+        return self.db_manager.execute("""
+            SELECT to_email, next_attempt_at FROM outbox
+            WHERE status != 'failed' AND next_attempt_at >= ?
+        """, (since,)).fetchall()
+
+    def count_since(self, created_after: str) -> int:
+        """Messages queued after the given ISO timestamp that haven't failed"""
+        return self.db_manager.execute(
+            "SELECT COUNT(*) FROM outbox WHERE status != 'failed' AND created_at >= ?",
+            (created_after,)).fetchone()[0]
+
+    def prune(self, cutoff: str):
+        """Drop finished messages created before the cutoff (ISO timestamp)"""
+        self.db_manager.execute(
+            "DELETE FROM outbox WHERE status IN ('sent', 'failed') AND created_at < ?", (cutoff,))
+
+
+def recipient_domain(email: str) -> str:
+    return email.rpartition('@')[2].lower()
+
+
+class SendScheduler:
+    """Assigns each new outbox message a send time
+
+    Every send is at least a random delay drawn from `delay` away from any
+    other, two messages to the same recipient domain are at least
+    domain_spacing seconds apart, and no more than daily_cap messages are
+    queued per calendar day. A message held back by its domain doesn't hold
+    up the others: each takes the earliest gap that fits, around whatever
+    earlier runs sent recently or left queued. load() reads that state on
+    the database thread; assign() is pure.
+    """
+
+    def __init__(self, outbox: Outbox, delay: Tuple[float, float] = (60.0, 120.0),
+                 domain_spacing: float = 3600.0, daily_cap: int = 15):
+        self.outbox = outbox
+        self.delay = delay
+        self.domain_spacing = domain_spacing
+        self.daily_cap = daily_cap
+        self.remaining = daily_cap
+        self.scheduled = 0
+        self._slots: List[float] = []
+        self._domain_last: Dict[str, float] = {}
+
+    def load(self):
+        now = time.time()
+        midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+        self.remaining = max(self.daily_cap - self.outbox.count_since(midnight), 0)
+        self._domain_last = {}
+        sends = self.outbox.scheduled_sends(now - max(self.domain_spacing, self.delay[1]))
+        self._slots = sorted(at for _, at in sends)
+        for to_email, at in sends:
+            domain = recipient_domain(to_email)
+            self._domain_last[domain] = max(self._domain_last.get(domain, 0.0), at)
+
+    def assign(self, to_email: str) -> Optional[float]:
+        """Send time for a message to `to_email`, or None once the daily cap is reached"""
+        if self.remaining <= 0:
+            return None
+        domain = recipient_domain(to_email)
+        slot = max(time.time(), self._domain_last.get(domain, 0.0) + self.domain_spacing)
+        gap = random.uniform(*self.delay)
+        for other in self._slots:
+            if other + gap <= slot:
+                continue
+            if slot + gap <= other:
+                break
+            slot = other + gap
+        bisect.insort(self._slots, slot)
+        self._domain_last[domain] = slot
+        self.remaining -= 1
+        self.scheduled += 1
+        return slot
+
+    @property
+    def projected_completion(self) -> Optional[datetime]:
+        """When the last scheduled message is due"""
+        return datetime.fromtimestamp(self._slots[-1]) if self._slots else None
+
+
+class OutboxWorker:
+    """Delivers due outbox messages with at most max_in_flight concurrent sends
+
+    `send` is a blocking callable (an SMTP exchange) run in a worker thread
+    so the event loop keeps serving the other phases. Messages go out when
+    their send time (set by SendScheduler, or a retry's backoff) comes due.
+    The worker returns once nothing is in flight and the outbox is empty or
+    the next message is more than max_idle seconds away (with max_idle=0,
+    once what is due now has gone out); the rest stay queued for the next
+    drain.
+    """
+
+    def __init__(self, outbox: Outbox, send: Callable[[OutboxMessage], None], max_in_flight: int = 2,
+                 max_idle: float = 900.0):
+        self.outbox = outbox
+        self.send = send
+        self.max_in_flight = max_in_flight
+        self.max_idle = max_idle
+        self.delivered: List[OutboxMessage] = []
+        self.failed: List[OutboxMessage] = []
+
+    async def _deliver(self, message: OutboxMessage):
+        aio = self.outbox.db_manager.aio
+        try:
+            await asyncio.to_thread(self.send, message)
+        except Exception as e:
+            retry = await aio.run(self.outbox.mark_failed, message, str(e))
+            logger.error(f"Failed to send email to {message.to_email} "
+                         f"(attempt {message.attempts + 1}{', will retry' if retry else ', giving up'}): {e}")
+            if not retry:
+                self.failed.append(message)
+            return
+        await aio.run(self.outbox.mark_sent, message)
+        self.delivered.append(message)
+        logger.info(f"Email sent successfully to {message.to_email}")
+
+    async def run(self) -> List[OutboxMessage]:
+        """Drain the outbox; returns the messages delivered"""
+        aio = self.outbox.db_manager.aio
+        recovered = await aio.run(self.outbox.recover)
+        if recovered:
+            logger.info(f"Requeued {recovered} message(s) interrupted mid-send")
+
+        in_flight = set()
+        while True:
+            if len(in_flight) < self.max_in_flight:
+                for message in await aio.run(self.outbox.claim_due, self.max_in_flight - len(in_flight)):
+                    in_flight.add(asyncio.create_task(self._deliver(message)))
+
+            next_due = await aio.run(self.outbox.next_due_at)
+            if not in_flight and (next_due is None or next_due - time.time() > self.max_idle):
+                break
+
+            # Sleep until a send finishes or, with a free slot, the next message is due
+            timeout = None
+            if next_due is not None and len(in_flight) < self.max_in_flight:
+                timeout = max(next_due - time.time(), 0)
+            if in_flight:
+                _, in_flight = await asyncio.wait(in_flight, timeout=timeout,
+                                                  return_when=asyncio.FIRST_COMPLETED)
+            else:
+                await asyncio.sleep(timeout)
+
+        return self.delivered
@@ -19,21 +19,26 @@ License: MIT
 
 import asyncio
 import aiohttp
-import smtplib
+import base64
 import sqlite3
 import json
 import time
 import random
-import re
 import logging
 import sys
 import os
+import threading
+import tempfile
+import functools
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from email.mime.text import MIMEText
+from email.policy import compat32
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 
-from email.mime.multipart import MIMEMultipart
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from dataclasses import dataclass, asdict
 from urllib.parse import urljoin, urlparse
 from urllib.robotparser import RobotFileParser
@@ -41,7 +46,6 @@ import os
 from pathlib import Path
 import argparse
 from dotenv import load_dotenv
-import requests
 
 # Load environment variables
 load_dotenv()
@@ -57,8 +61,33 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Add blog generator after logger is defined
+# Make sibling modules importable regardless of the working directory
 sys.path.append(str(Path(__file__).parent))
+from schema_migrations import apply_migrations
+from url_index import TargetUrlIndex, canonicalize_url, canonical_domain
+from http_cache import HttpCache, FetchResult, read_body
+from contact_rules import ContactRules
+from contact_extractor import ContactExtractor, PageContacts, extract_contacts
+from page_fingerprint import FingerprintStore, PageFingerprint
+from github_discovery import GitHubDiscovery
+from crawl_checkpoint import CrawlCheckpoint
+from smtp_pool import SMTPConnectionPool
+from outbox import Outbox, OutboxMessage, OutboxWorker, SendScheduler
+from smtp_sink import SMTPSink
+from template_engine import TemplateStore
+from analytics_providers import AnalyticsEngine, AnalyticsProvider, default_providers, fake_providers
+from timeseries import ANALYTICS_ROLLUP, DAILY_STATS_ROLLUP, MONTH, ROLLUPS
+
+# Header encoding as Message.as_string() does it (compat32, no folding), with SMTP line endings
+MIME_HEADER_POLICY = compat32.clone(linesep='\r\n', max_line_length=0)
+
+def mime_header(name: str, value: str) -> str:
+    """One encoded header line; plain ASCII values (the common case) skip the email package"""
+    if value.isascii() and '\r' not in value and '\n' not in value:
+        return f"{name}: {value}\r\n"
+    return MIME_HEADER_POLICY.fold(name, value)
+
+# Add blog generator after logger is defined
 try:
     from blog_generator import BlogArticleGenerator
     BLOG_ENABLED = True
@@ -82,157 +111,581 @@ class Target:
     notes: str = ""
     created_at: str = ""
     updated_at: str = ""
-
-class DatabaseManager:
-    """Handles all database operations"""
+    canonical_domain: str = ""
+    
+    def __post_init__(self):
+        # Key every target on its canonical URL so trivially different
+        # spellings of the same site collapse to one row
+        self.url = canonicalize_url(self.url)
+        self.canonical_domain = self.canonical_domain or canonical_domain(self.url)
+
+class ConnectionManager:
+    """Owns long-lived SQLite connections and the named statements shared by every database consumer"""
+    
+    PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',  # Safe with WAL, avoids an fsync per commit
+        'cache_size': -64000,     # ~64MB page cache (negative = KiB)
+        'mmap_size': 268435456,   # 256MB memory-mapped reads
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,     # ms to wait on a locked database
+    }
     
-    def __init__(self, db_path: str = "outreach_automation.db"):
+    def __init__(self, db_path: str, statement_cache_size: int = 256):
         self.db_path = db_path
-        self.init_database()
+        self.statement_cache_size = statement_cache_size
+        self.statements: Dict[str, str] = {}
+        self._connections: Dict[Tuple[int, Optional[int]], sqlite3.Connection] = {}
+        self._lock = threading.Lock()
     
-    def init_database(self):
-        """Initialize the SQLite database with required tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+    def _connection_key(self) -> Tuple[int, Optional[int]]:
+        """Key connections by thread and, inside coroutines, by event loop"""
+        try:
+            loop_id = id(asyncio.get_running_loop())
+        except RuntimeError:
+            loop_id = None
+        return threading.get_ident(), loop_id
+    
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, cached_statements=self.statement_cache_size)
+        for pragma, value in self.PRAGMAS.items():
+            conn.execute(f"PRAGMA {pragma} = {value}")
+        return conn
+    
+    def connection(self) -> sqlite3.Connection:
+        """Return the connection owned by the calling thread/event loop"""
+        key = self._connection_key()
+        conn = self._connections.get(key)
+        if conn is None:
+            conn = self._open()
+            with self._lock:
+                self._connections[key] = conn
+        return conn
+    
+    def register(self, name: str, sql: str):
+        """Register a named statement for reuse across all callers"""
+        self.statements[name] = sql
+    
+    def execute(self, statement: str, params: Tuple = ()) -> sqlite3.Cursor:
+        """Execute a registered statement (by name) or raw SQL"""
+        sql = self.statements.get(statement, statement)
+        return self.connection().execute(sql, params)
+    
+    def executemany(self, statement: str, seq_of_params) -> sqlite3.Cursor:
+        """Execute a registered statement (by name) or raw SQL for many rows"""
+        sql = self.statements.get(statement, statement)
+        return self.connection().executemany(sql, seq_of_params)
+    
+    @contextmanager
+    def transaction(self):
+        """Run a block of statements in one transaction on the shared connection"""
+        conn = self.connection()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    
+    def close_current(self):
+        """Close the connection owned by the calling thread/event loop"""
+        with self._lock:
+            conn = self._connections.pop(self._connection_key(), None)
+        if conn is not None:
+            conn.close()
+    
+    def close_all(self):
+        """Close every connection opened by this manager"""
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                # Connection belongs to another thread; it is released with it
+                pass
+
+def _migrate_canonical_urls(conn: sqlite3.Connection):
+    """Canonicalize stored target URLs, merging rows that collapse together"""
+    conn.execute("ALTER TABLE targets ADD COLUMN canonical_domain TEXT")
+    
+    groups: Dict[str, List[Tuple]] = {}
+    for row in conn.execute("""
+        SELECT id, url, email, contact_count, last_contacted FROM targets ORDER BY id
+    """).fetchall():
+        groups.setdefault(canonicalize_url(row[1]), []).append(row)
+    
+    for url, rows in groups.items():
+        keep_id = rows[0][0]
+        duplicate_ids = [row[0] for row in rows[1:]]
+        email = next((row[2] for row in rows if row[2]), rows[0][2])
+        contact_count = max(row[3] or 0 for row in rows)
+        last_contacted = max((row[4] for row in rows if row[4]), default=None)
+        
+        if duplicate_ids:
+            # Keep the oldest row; move outreach history onto it first
+            placeholders = ','.join('?' * len(duplicate_ids))
+            for table in ('outreach_log', 'responses'):
+                conn.execute(f"UPDATE {table} SET target_id = ? WHERE target_id IN ({placeholders})",
+                             [keep_id] + duplicate_ids)
+            conn.execute(f"DELETE FROM targets WHERE id IN ({placeholders})", duplicate_ids)
+        
+        conn.execute("""
+            UPDATE targets
+            SET url = ?, canonical_domain = ?, email = ?, contact_count = ?, last_contacted = ?
+            WHERE id = ?
+        """, (url, canonical_domain(url), email, contact_count, last_contacted, keep_id))
+    
+    # Serves both the per-organization contact count and the email dedupe
+    conn.execute("CREATE INDEX idx_targets_canonical_domain ON targets (canonical_domain, email)")
+
+def _migrate_rollups(conn: sqlite3.Connection):
+    """Create the rollup tables and fold in the raw days still stored"""
+    for series in ROLLUPS:
+        conn.execute(series.create_sql())
+        series.rebuild(conn)
+
+# Numbered schema migrations for outreach_automation.db, applied once each by
+# schema_migrations.apply_migrations. Append new versions; never edit old ones.
+SCHEMA_MIGRATIONS = [
+    # 1: Core tables (IF NOT EXISTS so databases created before versioning adopt cleanly)
+    [
         # Targets table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS targets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                url TEXT UNIQUE NOT NULL,
-                category TEXT NOT NULL,
-                email TEXT,
-                contact_name TEXT,
-                contact_role TEXT,
-                description TEXT,
-                last_contacted TEXT,
-                contact_count INTEGER DEFAULT 0,
-                priority INTEGER DEFAULT 1,
-                notes TEXT,
-                created_at TEXT,
-                updated_at TEXT
-            )
-        """)
-        
+        """
+        CREATE TABLE IF NOT EXISTS targets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            url TEXT UNIQUE NOT NULL,
+            category TEXT NOT NULL,
+            email TEXT,
+            contact_name TEXT,
+            contact_role TEXT,
+            description TEXT,
+            last_contacted TEXT,
+            contact_count INTEGER DEFAULT 0,
+            priority INTEGER DEFAULT 1,
+            notes TEXT,
+            created_at TEXT,
+            updated_at TEXT
+        )
+        """,
         # Outreach log table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS outreach_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                target_id INTEGER,
-                email_sent TEXT,
-                subject TEXT,
-                message_template TEXT,
-                status TEXT,
-                response_received TEXT,
-                created_at TEXT,
-                FOREIGN KEY (target_id) REFERENCES targets (id)
-            )
-        """)
-        
+        """
+        CREATE TABLE IF NOT EXISTS outreach_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            target_id INTEGER,
+            email_sent TEXT,
+            subject TEXT,
+            message_template TEXT,
+            status TEXT,
+            response_received TEXT,
+            created_at TEXT,
+            FOREIGN KEY (target_id) REFERENCES targets (id)
+        )
+        """,
         # Daily stats table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS daily_stats (
-                date TEXT PRIMARY KEY,
-                new_targets_found INTEGER DEFAULT 0,
-                emails_sent INTEGER DEFAULT 0,
-                responses_received INTEGER DEFAULT 0,
-                total_targets INTEGER DEFAULT 0
-            )
-        """)
-        
+        """
+        CREATE TABLE IF NOT EXISTS daily_stats (
+            date TEXT PRIMARY KEY,
+            new_targets_found INTEGER DEFAULT 0,
+            emails_sent INTEGER DEFAULT 0,
+            responses_received INTEGER DEFAULT 0,
+            total_targets INTEGER DEFAULT 0
+        )
+        """,
         # Responses received table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS responses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                target_id INTEGER,
-                response_type TEXT,
-                response_content TEXT,
-                sentiment TEXT,
-                follow_up_needed BOOLEAN DEFAULT 0,
-                created_at TEXT,
-                FOREIGN KEY (target_id) REFERENCES targets (id)
-            )
-        """)
-        
+        """
+        CREATE TABLE IF NOT EXISTS responses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            target_id INTEGER,
+            response_type TEXT,
+            response_content TEXT,
+            sentiment TEXT,
+            follow_up_needed BOOLEAN DEFAULT 0,
+            created_at TEXT,
+            FOREIGN KEY (target_id) REFERENCES targets (id)
+        )
+        """,
         # New sources discovered table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS discovered_sources (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                source_url TEXT,
-                source_type TEXT,
-                discovery_method TEXT,
-                potential_targets_found INTEGER DEFAULT 0,
-                last_checked TEXT,
-                active BOOLEAN DEFAULT 1,
-                created_at TEXT
-            )
-        """)
-        
+        """
+        CREATE TABLE IF NOT EXISTS discovered_sources (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source_url TEXT,
+            source_type TEXT,
+            discovery_method TEXT,
+            potential_targets_found INTEGER DEFAULT 0,
+            last_checked TEXT,
+            active BOOLEAN DEFAULT 1,
+            created_at TEXT
+        )
+        """,
         # Analytics tracking table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS analytics_tracking (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date TEXT,
-                website_visitors INTEGER DEFAULT 0,
-                website_page_views INTEGER DEFAULT 0,
-                youtube_views INTEGER DEFAULT 0,
-                youtube_subscribers INTEGER DEFAULT 0,
-                github_stars INTEGER DEFAULT 0,
-                github_forks INTEGER DEFAULT 0,
-                social_mentions INTEGER DEFAULT 0,
-                created_at TEXT
-            )
-        """)
+        """
+        CREATE TABLE IF NOT EXISTS analytics_tracking (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT,
+            website_visitors INTEGER DEFAULT 0,
+            website_page_views INTEGER DEFAULT 0,
+            youtube_views INTEGER DEFAULT 0,
+            youtube_subscribers INTEGER DEFAULT 0,
+            github_stars INTEGER DEFAULT 0,
+            github_forks INTEGER DEFAULT 0,
+            social_mentions INTEGER DEFAULT 0,
+            created_at TEXT
+        )
+        """,
+    ],
+    # 2: Indexes backing the outreach selection and reporting queries
+    [
+        # Partial index matching the outreach eligibility predicate; rows come
+        # out already sorted for ORDER BY priority DESC, created_at ASC, and the
+        # trailing columns make the pending-targets count a covering scan
+        """
+        CREATE INDEX IF NOT EXISTS idx_targets_outreach
+        ON targets (priority DESC, created_at, last_contacted, contact_count, email)
+        WHERE contact_count < 4 AND email IS NOT NULL AND email != ''
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_targets_category ON targets (category)",
+        "CREATE INDEX IF NOT EXISTS idx_outreach_log_created_at ON outreach_log (created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_outreach_log_target_id ON outreach_log (target_id)",
+        "CREATE INDEX IF NOT EXISTS idx_responses_created_at ON responses (created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_responses_target_id ON responses (target_id)",
+        "CREATE INDEX IF NOT EXISTS idx_discovered_sources_created_at ON discovered_sources (created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_analytics_tracking_date ON analytics_tracking (date)",
+    ],
+    # 3: Canonical target URLs and per-organization domain key
+    _migrate_canonical_urls,
+    # 4: robots.txt cache shared between runs
+    [
+        """
+        CREATE TABLE IF NOT EXISTS robots_cache (
+            origin TEXT PRIMARY KEY,
+            status INTEGER NOT NULL,
+            body TEXT,
+            expires_at REAL NOT NULL,
+            fetched_at TEXT
+        )
+        """,
+    ],
+    # 5: Content fingerprints of crawled pages, source re-check lookups
+    [
+        """
+        CREATE TABLE IF NOT EXISTS page_fingerprints (
+            url TEXT PRIMARY KEY,
+            content_hash BLOB NOT NULL,
+            simhash INTEGER NOT NULL,
+            last_checked TEXT,
+            last_changed TEXT
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_discovered_sources_source_url ON discovered_sources (source_url)",
+    ],
+    # 6: GitHub organization profiles shared between queries and runs
+    [
+        """
+        CREATE TABLE IF NOT EXISTS github_orgs (
+            login TEXT PRIMARY KEY,
+            name TEXT,
+            email TEXT,
+            blog TEXT,
+            fetched_at REAL NOT NULL
+        )
+        """,
+    ],
+    # 7: Checkpoints of in-progress discovery crawls (--resume)
+    [
+        """
+        CREATE TABLE IF NOT EXISTS discovery_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at TEXT,
+            finished_at TEXT,
+            status TEXT NOT NULL DEFAULT 'running'
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS discovery_frontier (
+            run_id INTEGER NOT NULL,
+            url_key TEXT NOT NULL,
+            url TEXT NOT NULL,
+            meta TEXT NOT NULL,
+            source TEXT,
+            done INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (run_id, url_key)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS discovery_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id INTEGER NOT NULL,
+            result TEXT NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_discovery_results_run_id ON discovery_results (run_id)",
+    ],
+    # 8: Outbox of rendered outreach emails awaiting delivery
+    [
+        """
+        CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            target_id INTEGER,
+            target_url TEXT,
+            outreach_log_id INTEGER,
+            to_email TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            body TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL NOT NULL,
+            last_error TEXT,
+            created_at TEXT,
+            sent_at TEXT,
+            FOREIGN KEY (target_id) REFERENCES targets (id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at)",
+    ],
+    # 9: Analytics API results shared by the daily run and the weekly report
+    [
+        """
+        CREATE TABLE IF NOT EXISTS analytics_cache (
+            key TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            fetched_at REAL NOT NULL
+        )
+        """,
+    ],
+    # 10: API units spent per analytics provider per day, for the daily budgets
+    [
+        """
+        CREATE TABLE IF NOT EXISTS analytics_usage (
+            provider TEXT NOT NULL,
+            date TEXT NOT NULL,
+            spent INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (provider, date)
+        )
+        """,
+    ],
+    # 11: Weekly/monthly rollups of daily_stats and analytics_tracking
+    _migrate_rollups,
+]
+
+class DatabaseManager:
+    """Handles all database operations"""
+    
+    # Hot-path statements shared with the tracker classes through the
+    # connection manager's registry
+    STATEMENTS = {
+        'target_id_by_url': "SELECT id FROM targets WHERE url = ?",
+        'insert_target': """
+            INSERT OR IGNORE INTO targets 
+            (name, url, category, email, contact_name, contact_role, 
+             description, priority, created_at, updated_at, canonical_domain)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        'org_target_emails': "SELECT email FROM targets WHERE canonical_domain = ?",
+        'targets_for_outreach': """
+            SELECT * FROM targets 
+            WHERE contact_count < 4 
+            AND (last_contacted IS NULL OR last_contacted < ?)
+            AND email IS NOT NULL AND email != ''
+            ORDER BY priority DESC, created_at ASC
+            LIMIT ?
+        """,
+        'update_contact_status': """
+            UPDATE targets 
+            SET last_contacted = ?, contact_count = contact_count + 1, updated_at = ?
+            WHERE url = ?
+        """,
+        'insert_outreach_log': """
+            INSERT INTO outreach_log 
+            (target_id, subject, message_template, status, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        """,
+        'count_targets': "SELECT COUNT(*) FROM targets",
+        'recent_outreach_count': """
+            SELECT COUNT(*) FROM outreach_log
+            WHERE created_at >= ? AND status IN ('sent', 'delivered')
+        """,
+        # Non-empty incoming contact fields refresh the row; outreach history
+        # (contact_count, last_contacted, created_at) is never touched
+        'upsert_target': """
+            INSERT INTO targets 
+            (name, url, category, email, contact_name, contact_role, 
+             description, priority, created_at, updated_at, canonical_domain)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                name = excluded.name,
+                category = excluded.category,
+                email = COALESCE(NULLIF(excluded.email, ''), targets.email),
+                contact_name = COALESCE(NULLIF(excluded.contact_name, ''), targets.contact_name),
+                contact_role = COALESCE(NULLIF(excluded.contact_role, ''), targets.contact_role),
+                description = COALESCE(NULLIF(excluded.description, ''), targets.description),
+                priority = excluded.priority,
+                updated_at = excluded.updated_at
+        """,
+    }
+    
+    # Queries issued by reports/generate_report.py against the same schema,
+    # included in the --explain diagnostic
+    REPORT_QUERIES = {
+        'report_pending_targets': """
+            SELECT COUNT(*) FROM targets 
+            WHERE contact_count < 4 
+            AND (last_contacted IS NULL OR last_contacted < ?)
+            AND email IS NOT NULL AND email != ''
+        """,
+        'report_recent_outreach': """
+            SELECT t.name, t.email, t.category, ol.subject, ol.status, ol.created_at
+            FROM outreach_log ol
+            JOIN targets t ON ol.target_id = t.id
+            ORDER BY ol.created_at DESC
+            LIMIT 20
+        """,
+        'report_daily_stats': """
+            SELECT date, new_targets_found, emails_sent, responses_received, total_targets
+            FROM daily_stats 
+            WHERE date >= ? 
+            ORDER BY date DESC
+        """,
+    }
+    
+    def __init__(self, db_path: str = "outreach_automation.db", contacts_per_org: int = 4):
+        self.db_path = db_path
+        self.contacts_per_org = contacts_per_org
+        self.connections = ConnectionManager(db_path)
+        for name, sql in self.STATEMENTS.items():
+            self.connections.register(name, sql)
+        self.init_database()
+        self.url_index = TargetUrlIndex(self)
+        self.aio = AsyncDatabase(self)
+    
+    def execute(self, statement: str, params: Tuple = ()) -> sqlite3.Cursor:
+        """Execute a registered statement or raw SQL on the shared connection"""
+        return self.connections.execute(statement, params)
+    
+    def transaction(self):
+        """Context manager committing a group of writes on the shared connection"""
+        return self.connections.transaction()
+    
+    def close(self):
+        """Release all pooled connections"""
+        self.aio.close()
+        self.url_index.save()
+        self.connections.close_all()
+    
+    def init_database(self):
+        """Bring the database schema up to the latest migration"""
+        apply_migrations(self.connections.connection(), SCHEMA_MIGRATIONS)
+    
+    def explain_hot_queries(self) -> Dict[str, List[str]]:
+        """Return the EXPLAIN QUERY PLAN output for every hot query"""
+        # Registered by the owning classes; see register_statement_owners()
+        queries = {name: sql for name, sql in self.connections.statements.items()
+                   if sql.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE'))}
+        queries.update(self.REPORT_QUERIES)
+        
+        plans = {}
+        for name, sql in queries.items():
+            params = (None,) * sql.count('?')
+            rows = self.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+            plans[name] = [row[-1] for row in rows]
+        return plans
+    
+    def _within_org_limit(self, targets: Iterable[Target]) -> Tuple[List[Target], int]:
+        """Drop new targets whose organization is full or already has their email; returns (accepted, rejected count)"""
+        org_emails: Dict[str, List[str]] = {}
+        seen_urls = set()
+        accepted = []
+        rejected = 0
+        
+        for target in targets:
+            if target.url in seen_urls or target.url in self.url_index:
+                accepted.append(target)
+                continue
+            
+            domain = target.canonical_domain
+            if domain not in org_emails:
+                org_emails[domain] = [row[0] for row in self.execute('org_target_emails', (domain,))]
+            emails = org_emails[domain]
+            
+            if len(emails) >= self.contacts_per_org or (target.email and target.email in emails):
+                rejected += 1
+                continue
+            
+            emails.append(target.email)
+            seen_urls.add(target.url)
+            accepted.append(target)
         
-        conn.commit()
-        conn.close()
-        logger.info("Database initialized successfully")
+        return accepted, rejected
     
     def add_target(self, target: Target) -> bool:
         """Add a new target to the database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
             now = datetime.now().isoformat()
             target.created_at = now
             target.updated_at = now
             
-            cursor.execute("""
-                INSERT OR IGNORE INTO targets 
-                (name, url, category, email, contact_name, contact_role, 
-                 description, priority, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (target.name, target.url, target.category, target.email,
-                  target.contact_name, target.contact_role, target.description,
-                  target.priority, target.created_at, target.updated_at))
+            with self.transaction():
+                accepted, _ = self._within_org_limit([target])
+                if not accepted:
+                    logger.info(f"Skipping {target.url}: {target.canonical_domain} "
+                                f"already has its contacts or this email")
+                    return False
+                cursor = self.execute('insert_target', (
+                    target.name, target.url, target.category, target.email,
+                    target.contact_name, target.contact_role, target.description,
+                    target.priority, target.created_at, target.updated_at,
+                    target.canonical_domain))
             
-            success = cursor.rowcount > 0
-            conn.commit()
-            return success
+            added = cursor.rowcount > 0
+            if added:
+                self.url_index.add(target.url)
+            return added
         except Exception as e:
             logger.error(f"Error adding target: {e}")
             return False
-        finally:
-            conn.close()
+    
+    def add_targets_bulk(self, targets: Iterable[Target]) -> Dict[str, int]:
+        """Upsert many targets in a single transaction; returns 'inserted', 'updated' and 'skipped' counts"""
+        now = datetime.now().isoformat()
+        
+        urls = []
+        
+        def rows(accepted):
+            for target in accepted:
+                urls.append(target.url)
+                target.created_at = target.created_at or now
+                target.updated_at = now
+                yield (target.name, target.url, target.category, target.email,
+                       target.contact_name, target.contact_role, target.description,
+                       target.priority, target.created_at, target.updated_at,
+                       target.canonical_domain)
+        
+        conn = self.connections.connection()
+        try:
+            with self.transaction():
+                accepted, skipped = self._within_org_limit(targets)
+                count_before = self.execute('count_targets').fetchone()[0]
+                changes_before = conn.total_changes
+                self.connections.executemany('upsert_target', rows(accepted))
+                changes = conn.total_changes - changes_before
+                inserted = self.execute('count_targets').fetchone()[0] - count_before
+        except Exception as e:
+            logger.error(f"Error bulk adding targets: {e}")
+            return {'inserted': 0, 'updated': 0, 'skipped': 0}
+        
+        for url in urls:
+            self.url_index.add(url)
+        
+        return {'inserted': inserted, 'updated': changes - inserted, 'skipped': skipped}
     
     def get_targets_for_outreach(self, limit: int = 10) -> List[Target]:
         """Get targets ready for outreach (respecting cooldown periods)"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         cooldown_days = int(os.getenv("COOLDOWN_DAYS", "30"))
         cooldown_date = (datetime.now() - timedelta(days=cooldown_days)).isoformat()
         
-        cursor.execute("""
-            SELECT * FROM targets 
-            WHERE contact_count < 4 
-            AND (last_contacted IS NULL OR last_contacted < ?)
-            AND email IS NOT NULL AND email != ''
-            ORDER BY priority DESC, created_at ASC
-            LIMIT ?
-        """, (cooldown_date, limit))
+        cursor = self.execute('targets_for_outreach', (cooldown_date, limit))
         
         targets = []
         for row in cursor.fetchall():
@@ -240,59 +693,285 @@ class DatabaseManager:
                 name=row[1], url=row[2], category=row[3], email=row[4],
                 contact_name=row[5], contact_role=row[6], description=row[7],
                 last_contacted=row[8], contact_count=row[9], priority=row[10],
-                notes=row[11], created_at=row[12], updated_at=row[13]
+                notes=row[11], created_at=row[12], updated_at=row[13],
+                canonical_domain=row[14]
             )
             targets.append(target)
         
-        conn.close()
-        
         # If no targets found, this suggests we need more target discovery
         if not targets:
             logger.warning("No targets ready for outreach - consider running target discovery")
             
         return targets
     
+    def target_exists(self, url: str) -> bool:
+        """Check if a target URL is already stored (answered from the URL index)"""
+        return url in self.url_index
+    
+    def get_target_id(self, url: str) -> Optional[int]:
+        """Look up a target's row id by URL (in any form; stored URLs are canonical)"""
+        row = self.execute('target_id_by_url', (canonicalize_url(url),)).fetchone()
+        return row[0] if row else None
+    
     def update_contact_status(self, target_url: str, email_sent: bool = True):
         """Update target after contact attempt"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         now = datetime.now().isoformat()
         
-        cursor.execute("""
-            UPDATE targets 
-            SET last_contacted = ?, contact_count = contact_count + 1, updated_at = ?
-            WHERE url = ?
-        """, (now, now, target_url))
-        
-        conn.commit()
-        conn.close()
+        with self.transaction():
+            self.execute('update_contact_status', (now, now, canonicalize_url(target_url)))
     
     def log_outreach(self, target_id: int, subject: str, template: str, status: str):
         """Log outreach attempt"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO outreach_log 
-            (target_id, subject, message_template, status, created_at)
-            VALUES (?, ?, ?, ?, ?)
-        """, (target_id, subject, template, status, datetime.now().isoformat()))
+        with self.transaction():
+            self.execute('insert_outreach_log',
+                         (target_id, subject, template, status, datetime.now().isoformat()))
+
+class AsyncDatabase:
+    """Awaitable access to a DatabaseManager, run on one dedicated database thread"""
+    
+    def __init__(self, db_manager: 'DatabaseManager'):
+        self.db_manager = db_manager
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='outreach-db')
+    
+    async def run(self, func, *args, **kwargs):
+        """Run a blocking database callable on the database thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+    
+    async def target_exists(self, url: str) -> bool:
+        return await self.run(self.db_manager.target_exists, url)
+    
+    async def get_target_id(self, url: str) -> Optional[int]:
+        return await self.run(self.db_manager.get_target_id, url)
+    
+    async def add_targets_bulk(self, targets: Iterable[Target]) -> Dict[str, int]:
+        # Materialize first so the iterable is not consumed on another thread
+        return await self.run(self.db_manager.add_targets_bulk, list(targets))
+    
+    async def get_targets_for_outreach(self, limit: int = 10) -> List[Target]:
+        return await self.run(self.db_manager.get_targets_for_outreach, limit)
+    
+    async def update_contact_status(self, target_url: str, email_sent: bool = True):
+        return await self.run(self.db_manager.update_contact_status, target_url, email_sent)
+    
+    async def log_outreach(self, target_id: int, subject: str, template: str, status: str):
+        return await self.run(self.db_manager.log_outreach, target_id, subject, template, status)
+    
+    def close(self):
+        """Close the database thread's connection and stop the thread"""
+        self._executor.submit(self.db_manager.connections.close_current).result()
+        self._executor.shutdown(wait=True)
+
+class HostRateLimiter:
+    """Per-host token buckets pacing requests to each host independently"""
+    
+    def __init__(self, interval: float = 30.0, burst: int = 1, jitter: float = 0.0,
+                 max_defer: float = 120.0):
+        self.interval = interval
+        self.burst = burst
+        self.jitter = jitter
+        self.max_defer = max_defer
+        self.blocked: Set[str] = set()
+        self._buckets: Dict[str, Dict[str, float]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+    
+    @classmethod
+    def from_config(cls, limits: Dict) -> 'HostRateLimiter':
+        """Build from the config.json limits block"""
+        delay = limits.get('delay_between_requests', [30, 60])
+        low, high = (min(delay), max(delay)) if isinstance(delay, (list, tuple)) else (delay, delay)
+        burst = int(limits.get('request_burst', 1))
+        if burst < 1:
+            raise ValueError(f"limits.request_burst must be at least 1, got {burst}")
+        return cls(interval=float(low), burst=burst, jitter=float(high - low),
+                   max_defer=float(limits.get('max_retry_after', 120)))
+    
+    def _next_interval(self, bucket: Dict[str, float]) -> float:
+        return max(bucket['crawl_delay'], self.interval + random.uniform(0, self.jitter))
+    
+    def _bucket(self, host: str) -> Dict[str, float]:
+        if host not in self._buckets:
+            bucket = {
+                'tokens': float(self.burst),
+                'updated': time.monotonic(),
+                'crawl_delay': 0.0,
+                'blocked_until': 0.0,
+            }
+            bucket['interval'] = self._next_interval(bucket)
+            self._buckets[host] = bucket
+        return self._buckets[host]
+    
+    def set_crawl_delay(self, host: str, crawl_delay: Optional[float]):
+        """Apply a robots.txt Crawl-delay (never faster than the configured interval)"""
+        if crawl_delay:
+            bucket = self._bucket(host)
+            bucket['crawl_delay'] = float(crawl_delay)
+            bucket['interval'] = max(bucket['interval'], bucket['crawl_delay'])
+    
+    def defer(self, host: str, seconds: float) -> bool:
+        """Hold requests to a host for `seconds` (from Retry-After); False if that blocks it for the run"""
+        if seconds > self.max_defer:
+            self.blocked.add(host)
+            return False
+        bucket = self._bucket(host)
+        bucket['blocked_until'] = max(bucket['blocked_until'], time.monotonic() + seconds)
+        bucket['tokens'] = 0.0
+        return True
+    
+    async def acquire(self, host: str) -> bool:
+        """Wait until a request to `host` is allowed and consume a token; False if the host is blocked"""
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            bucket = self._bucket(host)
+            while True:
+                if host in self.blocked:
+                    return False
+                now = time.monotonic()
+                if now < bucket['blocked_until']:
+                    await asyncio.sleep(bucket['blocked_until'] - now)
+                    # The server asked us to come back now, so allow one request
+                    bucket['tokens'] = max(bucket['tokens'], 1.0)
+                    bucket['updated'] = time.monotonic()
+                    continue
+                
+                if bucket['interval'] <= 0:
+                    # No delay configured for this request: no pacing
+                    bucket['updated'] = now
+                    bucket['interval'] = self._next_interval(bucket)
+                    return True
+                
+                elapsed = now - bucket['updated']
+                bucket['tokens'] = min(float(self.burst), bucket['tokens'] + elapsed / bucket['interval'])
+                bucket['updated'] = now
+                if bucket['tokens'] >= 1:
+                    bucket['tokens'] -= 1
+                    bucket['interval'] = self._next_interval(bucket)
+                    return True
+                await asyncio.sleep((1 - bucket['tokens']) * bucket['interval'])
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+class RobotsCache:
+    """robots.txt rules per origin, fetched asynchronously at most once per TTL"""
+    
+    MAX_BODY_BYTES = 512 * 1024
+    
+    def __init__(self, db_manager: Optional['DatabaseManager'] = None,
+                 ttl: float = 24 * 3600, negative_ttl: float = 3600):
+        self.db_manager = db_manager
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._rules: Dict[str, Tuple[RobotFileParser, float]] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+        if db_manager:
+            db_manager.connections.register('robots_get', """
+                SELECT status, body, expires_at FROM robots_cache WHERE origin = ?
+            """)
+            db_manager.connections.register('robots_put', """
+                INSERT OR REPLACE INTO robots_cache (origin, status, body, expires_at, fetched_at)
+                VALUES (?, ?, ?, ?, ?)
+            """)
+    
+    @staticmethod
+    def _parser(status: int, body: str) -> RobotFileParser:
+        rp = RobotFileParser()
+        if status in (401, 403):
+            rp.disallow_all = True
+        elif status == 200:
+            rp.parse(body.splitlines())
+        else:
+            rp.allow_all = True  # Missing or unreachable robots.txt: assume allowed
+        return rp
+    
+    async def get(self, session: aiohttp.ClientSession, url: str) -> RobotFileParser:
+        """Return the parsed rules for the origin of `url`"""
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc.lower()}"
+        
+        cached = self._rules.get(origin)
+        if cached and cached[1] > time.time():
+            return cached[0]
+        
+        # Concurrent requests for one origin share a single fetch
+        if origin not in self._pending:
+            task = asyncio.ensure_future(self._load(session, origin))
+            task.add_done_callback(lambda _: self._pending.pop(origin, None))
+            self._pending[origin] = task
+        return await asyncio.shield(self._pending[origin])
+    
+    async def _load(self, session: aiohttp.ClientSession, origin: str) -> RobotFileParser:
+        row = None
+        if self.db_manager:
+            row = await self.db_manager.aio.run(self._read, origin)
         
-        conn.commit()
-        conn.close()
+        if row and row[2] > time.time():
+            status, body, expires_at = row
+        else:
+            status, body = await self._fetch(session, origin)
+            ttl = self.negative_ttl if status == 0 or status >= 500 else self.ttl
+            expires_at = time.time() + ttl
+            if self.db_manager:
+                await self.db_manager.aio.run(self._store, origin, status, body, expires_at)
+        
+        rp = self._parser(status, body)
+        self._rules[origin] = (rp, expires_at)
+        return rp
+    
+    async def _fetch(self, session: aiohttp.ClientSession, origin: str) -> Tuple[int, str]:
+        try:
+            async with session.get(f"{origin}/robots.txt") as response:
+                if response.status != 200:
+                    return response.status, ""
+                raw = await response.content.read(self.MAX_BODY_BYTES)
+                return 200, raw.decode('utf-8', errors='replace')
+        except Exception as e:
+            logger.warning(f"Could not fetch robots.txt for {origin}: {e}")
+            return 0, ""
+    
+    def _read(self, origin: str) -> Optional[Tuple]:
+        return self.db_manager.execute('robots_get', (origin,)).fetchone()
+    
+    def _store(self, origin: str, status: int, body: str, expires_at: float):
+        with self.db_manager.transaction():
+            self.db_manager.execute('robots_put', (origin, status, body, expires_at,
+                                                   datetime.now().isoformat()))
 
 class WebScraper:
     """Handles web scraping with ethical practices"""
     
-    def __init__(self):
+    def __init__(self, rate_limiter: Optional[HostRateLimiter] = None,
+                 robots_cache: Optional[RobotsCache] = None,
+                 http_cache: Optional[HttpCache] = None,
+                 max_connections: int = 10, max_connections_per_host: int = 2,
+                 max_page_bytes: int = 1024 * 1024,
+                 contact_rules: Optional[ContactRules] = None,
+                 fingerprints: Optional[FingerprintStore] = None):
         self.session = None
         self.user_agent = "OpenBuild-Outreach-Bot/1.0 (+https://open.build)"
-        self.delay_range = (30, 60)  # seconds between requests
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.robots_cache = robots_cache or RobotsCache()
+        self.http_cache = http_cache
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.max_page_bytes = max_page_bytes
+        self.contact_rules = contact_rules or ContactRules()
+        self.fingerprints = fingerprints
     
     async def __aenter__(self):
         timeout = aiohttp.ClientTimeout(total=30)
-        connector = aiohttp.TCPConnector(limit=10, limit_per_host=2)
+        connector = aiohttp.TCPConnector(limit=self.max_connections,
+                                         limit_per_host=self.max_connections_per_host)
         self.session = aiohttp.ClientSession(
             timeout=timeout,
             connector=connector,
@@ -304,79 +983,213 @@ class WebScraper:
         if self.session:
             await self.session.close()
     
-    def can_fetch(self, url: str) -> bool:
+    async def can_fetch(self, url: str) -> bool:
         """Check robots.txt compliance"""
         try:
-            parsed_url = urlparse(url)
-            robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
-            
-            rp = RobotFileParser()
-            rp.set_url(robots_url)
-            rp.read()
-            
+            rp = await self.robots_cache.get(self.session, url)
+            self.rate_limiter.set_crawl_delay(urlparse(url).netloc.lower(), rp.crawl_delay(self.user_agent))
             return rp.can_fetch(self.user_agent, url)
-        except:
+        except Exception:
             return True  # If robots.txt can't be fetched, assume allowed
     
-    async def fetch_page(self, url: str) -> Optional[str]:
-        """Fetch a web page with rate limiting and error handling"""
-        if not self.can_fetch(url):
+    async def _get(self, url: str, on_chunk=None) -> FetchResult:
+        """GET through the HTTP cache (conditional request) when one is configured"""
+        if self.http_cache:
+            return await self.http_cache.fetch(self.session, url, on_chunk=on_chunk,
+                                               max_bytes=self.max_page_bytes)
+        async with self.session.get(url) as response:
+            streaming = on_chunk if response.status == 200 else None
+            body, truncated = await read_body(response, streaming, self.max_page_bytes,
+                                              keep=streaming is None)
+            return FetchResult(response.status, body, response.headers.copy(),
+                               response.headers.get('Content-Type'), truncated=truncated)
+    
+    async def _fetch(self, url: str, on_chunk=None) -> Optional[FetchResult]:
+        """Fetch a URL with robots.txt, rate limiting and Retry-After handling"""
+        host = urlparse(url).netloc.lower()
+        if host in self.rate_limiter.blocked:
+            return None
+        if not await self.can_fetch(url):
             logger.warning(f"Robots.txt disallows fetching: {url}")
             return None
         
         try:
-            await asyncio.sleep(random.uniform(*self.delay_range))
-            
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    return await response.text()
-                else:
-                    logger.warning(f"HTTP {response.status} for {url}")
+            for attempt in range(2):
+                if not await self.rate_limiter.acquire(host):
                     return None
+                
+                result = await self._get(url, on_chunk)
+                if result.status == 200:
+                    if result.truncated:
+                        logger.info(f"Read only the first {self.max_page_bytes} bytes of {url}")
+                    return result
+                
+                retry_after = parse_retry_after(result.headers.get('Retry-After'))
+                if result.status in (429, 503) and retry_after is not None:
+                    if not self.rate_limiter.defer(host, retry_after):
+                        logger.warning(f"HTTP {result.status} for {url} with Retry-After {retry_after:.0f}s, "
+                                       f"skipping {host} for the rest of the run")
+                        return None
+                    if attempt == 0:
+                        logger.info(f"HTTP {result.status} for {url}, retrying after {retry_after:.0f}s")
+                        continue
+                
+                logger.warning(f"HTTP {result.status} for {url}")
+                return None
         except Exception as e:
             logger.error(f"Error fetching {url}: {e}")
             return None
     
+    async def fetch_page(self, url: str) -> Optional[str]:
+        """Fetch a web page with rate limiting and error handling"""
+        result = await self._fetch(url)
+        return result.text() if result else None
+    
+    async def fetch_contacts(self, url: str, need_links: bool = False) -> Optional[PageContacts]:
+        """Fetch a page and extract its contacts while the body streams in"""
+        extractor = ContactExtractor(self.contact_rules)
+        fingerprint = PageFingerprint()
+        
+        def consume(chunk: bytes):
+            fingerprint.update(chunk)
+            extractor.feed(chunk)
+        
+        sink = consume if self.fingerprints else extractor.feed
+        result = await self._fetch(url, sink)
+        if result is None:
+            return None
+        
+        if result.from_cache:
+            if (not need_links and self.fingerprints
+                    and await self.fingerprints.db_manager.aio.run(self.fingerprints.touch, url)):
+                return PageContacts(unchanged=True)
+            sink(result.body)
+        
+        page = extractor.finish(result.charset)
+        if self.fingerprints:
+            status, duplicate_of = await self.fingerprints.db_manager.aio.run(
+                self.fingerprints.classify, url, fingerprint)
+            page.unchanged = status in ('unchanged', 'duplicate')
+            page.duplicate_of = duplicate_of or ""
+        return page
+    
     def extract_emails(self, html: str) -> List[str]:
         """Extract email addresses from HTML"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, html, re.IGNORECASE)
-        
-        # Filter out common non-contact emails
-        filtered_emails = []
-        skip_patterns = ['noreply', 'no-reply', 'donotreply', 'support', 'info@example']
-        
-        for email in emails:
-            if not any(pattern in email.lower() for pattern in skip_patterns):
-                filtered_emails.append(email.lower())
-        
-        return list(set(filtered_emails))  # Remove duplicates
+        return extract_contacts(html, self.contact_rules).emails
     
     def extract_contact_info(self, html: str, base_url: str) -> Dict[str, str]:
         """Extract contact information from HTML"""
-        contact_info = {'emails': [], 'names': [], 'roles': []}
-        
-        # Extract emails
-        contact_info['emails'] = self.extract_emails(html)
-        
-        # Extract names (basic pattern matching)
-        name_patterns = [
-            r'CEO[:\s]+([A-Z][a-z]+ [A-Z][a-z]+)',
-            r'Founder[:\s]+([A-Z][a-z]+ [A-Z][a-z]+)',
-            r'Contact[:\s]+([A-Z][a-z]+ [A-Z][a-z]+)',
-        ]
-        
-        for pattern in name_patterns:
-            matches = re.findall(pattern, html, re.IGNORECASE)
-            contact_info['names'].extend(matches)
-        
-        return contact_info
+        return extract_contacts(html, self.contact_rules).as_contact_info()
+
+class CrawlFrontier:
+    """Crawl scheduler running many hosts concurrently, each host sequentially"""
+    
+    def __init__(self, scraper: WebScraper, handler, max_concurrent_hosts: int = 10,
+                 checkpoint: Optional[CrawlCheckpoint] = None):
+        self.scraper = scraper
+        self.handler = handler
+        self.max_concurrent_hosts = max_concurrent_hosts
+        self.checkpoint = checkpoint
+        self.visited = set()
+        self.results: List[Dict] = []
+        self._queues: Dict[str, deque] = {}
+        self._scheduled_hosts = set()
+        self._ready_hosts: asyncio.Queue = asyncio.Queue()
+        self._unsaved = []
+    
+    def add(self, url: str, **meta) -> bool:
+        """Queue a URL once per crawl; returns False if it was already seen"""
+        key = canonicalize_url(url)
+        if key in self.visited:
+            return False
+        self.visited.add(key)
+        if self.checkpoint:
+            self._unsaved.append((key, url, meta))
+        self._enqueue(url, meta)
+        return True
+    
+    def restore(self, rows: List[Tuple[str, str, Dict, bool]], results: List[Dict]):
+        """Rebuild the visited set, queue and results from a checkpoint"""
+        for key, url, meta, done in rows:
+            self.visited.add(key)
+            if not done:
+                self._enqueue(url, meta)
+        self.results.extend(results)
+    
+    async def save(self, done_key: Optional[str] = None, results: Optional[List[Dict]] = None):
+        """Checkpoint URLs queued since the last save (and a handled page)"""
+        if self.checkpoint:
+            queued, self._unsaved = self._unsaved, []
+            await self.checkpoint.db_manager.aio.run(self.checkpoint.record, done_key, queued, results or [])
+    
+    def _enqueue(self, url: str, meta: Dict):
+        host = urlparse(url).netloc.lower()
+        self._queues.setdefault(host, deque()).append((url, meta))
+        if host not in self._scheduled_hosts:
+            self._scheduled_hosts.add(host)
+            self._ready_hosts.put_nowait(host)
+    
+    @property
+    def host_count(self) -> int:
+        return len(self._queues)
+    
+    async def _drain_host(self, host: str):
+        queue = self._queues[host]
+        while queue:
+            if host in self.scraper.rate_limiter.blocked:
+                logger.info(f"Dropping {len(queue)} queued URLs for blocked host {host}")
+                queue.clear()
+                break
+            url, meta = queue.popleft()
+            results = []
+            try:
+                page = await self.scraper.fetch_contacts(url, need_links=meta.get('kind') == 'source')
+                if page:
+                    results = await self.handler(url, page, meta) or []
+                    self.results.extend(results)
+            except Exception as e:
+                logger.error(f"Error crawling {url}: {e}")
+            await self.save(canonicalize_url(url), results)
+        # No await between the emptiness check and this, so add() cannot race
+        self._scheduled_hosts.discard(host)
+    
+    async def _worker(self):
+        while True:
+            host = await self._ready_hosts.get()
+            try:
+                await self._drain_host(host)
+            finally:
+                self._ready_hosts.task_done()
+    
+    async def run(self):
+        """Crawl until every queued host (including newly added ones) is drained"""
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.max_concurrent_hosts)]
+        try:
+            await self._ready_hosts.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
 
 class TargetDiscovery:
     """Discovers potential targets from various sources"""
     
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, config: Dict = None, resume: bool = False):
         self.db_manager = db_manager
+        self.config = config or {}
+        self.resume = resume
+        discovery_config = self.config.get('discovery', {})
+        # Listing pages crawled for further targets: [{"url": ..., "category": ...}]
+        self.sources = discovery_config.get('sources', [])
+        self.max_urls_per_source = discovery_config.get('max_urls_per_source', 5)
+        self.max_concurrent_hosts = discovery_config.get('max_concurrent_hosts', 10)
+        self.max_page_bytes = discovery_config.get('max_page_kb', 1024) * 1024
+        self.contact_rules = ContactRules.from_config(self.config)
+        self.fingerprints = FingerprintStore(db_manager)
+        self.source_tracker = SourceDiscoveryTracker(db_manager)
+        self.http_cache = HttpCache(max_bytes=discovery_config.get('http_cache_mb', 256) * 1024 * 1024)
+        self.github = GitHubDiscovery(db_manager, self.http_cache, discovery_config.get('github'))
+        self.checkpoint = CrawlCheckpoint(db_manager)
         # Use more accessible and reliable sources for target discovery
         self.manual_targets = [
             {
@@ -507,6 +1320,13 @@ class TargetDiscovery:
         
         logger.info(f"Discovering targets from {len(self.manual_targets)} curated sources...")
         
+        # Load the URL index once; every membership check below is in-memory
+        await self.db_manager.aio.run(self.db_manager.url_index.load)
+        
+        # Start the GitHub API discovery so its network I/O overlaps the
+        # curated list processing below
+        github_discovery = asyncio.create_task(self._discover_from_github())
+        
         for target_data in self.manual_targets:
             # Check if target already exists
             if not self._target_exists(target_data['url']):
@@ -524,468 +1344,264 @@ class TargetDiscovery:
             else:
                 logger.info(f"Target already exists: {target_data['name']}")
         
+        # Crawl configured listing pages for further targets
+        if self.sources:
+            new_targets.extend(await self._discover_from_sources(self.sources))
+        
         # Also try to discover a few additional targets from reliable APIs
-        additional_targets = await self._discover_from_github()
+        additional_targets = await github_discovery
         new_targets.extend(additional_targets)
         
         logger.info(f"Discovered {len(new_targets)} new targets")
         return new_targets
     
+    async def commit(self):
+        """Once discovered targets are stored, keep the crawl's fingerprints and close its checkpoint"""
+        await self.db_manager.aio.run(self.fingerprints.commit)
+        if self.checkpoint.run_id is not None:
+            await self.db_manager.aio.run(self.checkpoint.finish)
+            self.checkpoint.run_id = None
+    
     def _target_exists(self, url: str) -> bool:
         """Check if target already exists in database"""
-        conn = sqlite3.connect(self.db_manager.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM targets WHERE url = ?", (url,))
-        exists = cursor.fetchone()[0] > 0
-        conn.close()
-        return exists
+        return self.db_manager.target_exists(url)
     
     async def _discover_from_github(self) -> List[Target]:
         """Discover targets from GitHub's developer ecosystem"""
         targets = []
         
         try:
-            # Look for developer education repositories
-            search_queries = [
-                'developer+education+organization',
-                'coding+bootcamp+company',
-                'programming+course+business'
-            ]
-            
-            for query in search_queries[:1]:  # Limit to 1 search per run
-                url = f"https://api.github.com/search/repositories?q={query}&sort=stars&order=desc&per_page=5"
+            for candidate in await self.github.discover():
+                org, repo = candidate['org'], candidate['repo']
+                if self._target_exists(repo['html_url']):
+                    continue
                 
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            
-                            for repo in data.get('items', [])[:2]:  # Max 2 per search
-                                if repo.get('owner', {}).get('type') == 'Organization':
-                                    org_name = repo['owner']['login']
-                                    repo_url = repo['html_url']
-                                    
-                                    # Try to find contact email from organization
-                                    org_url = repo['owner']['url']
-                                    async with session.get(org_url) as org_response:
-                                        if org_response.status == 200:
-                                            org_data = await org_response.json()
-                                            email = org_data.get('email', f"contact@{org_name.lower()}.com")
-                                            
-                                            if email and not self._target_exists(repo_url):
-                                                target = Target(
-                                                    name=org_name,
-                                                    url=repo_url,
-                                                    category='startup',
-                                                    email=email,
-                                                    contact_name=f"{org_name} Team",
-                                                    description=f"GitHub organization with {repo['stargazers_count']} stars - developer-focused",
-                                                    priority=2
-                                                )
-                                                targets.append(target)
-                                                logger.info(f"Discovered GitHub target: {org_name}")
-                                
-                                await asyncio.sleep(2)  # Rate limiting
-                        
-                await asyncio.sleep(5)  # Rate limiting between searches
-                        
+                targets.append(Target(
+                    name=org.name or org.login,
+                    url=repo['html_url'],
+                    category='startup',
+                    email=org.email,
+                    contact_name=f"{org.name or org.login} Team",
+                    description=f"GitHub organization with {repo['stargazers_count']} stars - developer-focused",
+                    priority=2
+                ))
+                logger.info(f"Discovered GitHub target: {org.login}")
+        
         except Exception as e:
             logger.error(f"Error discovering from GitHub: {e}")
         
         return targets
     
-    async def _discover_from_source(self, scraper: WebScraper, url: str, category: str) -> List[Target]:
-        """Discover targets from a specific source"""
-        targets = []
-        
-        try:
-            html = await scraper.fetch_page(url)
-            if not html:
-                return targets
+    def _scraper_from_config(self) -> WebScraper:
+        limits = self.config.get('limits', {})
+        return WebScraper(rate_limiter=HostRateLimiter.from_config(limits),
+                          robots_cache=RobotsCache(self.db_manager),
+                          http_cache=self.http_cache,
+                          max_page_bytes=self.max_page_bytes,
+                          contact_rules=self.contact_rules,
+                          fingerprints=self.fingerprints)
+    
+    def close(self):
+        """Release the HTTP cache"""
+        self.http_cache.close()
+    
+    async def _discover_from_sources(self, sources: List[Dict]) -> List[Target]:
+        """Crawl source pages and their candidate links across hosts concurrently"""
+        unchanged = 0
+        
+        async def handle_page(url: str, page: PageContacts, meta: Dict) -> List[Dict]:
+            nonlocal unchanged
+            unchanged += page.unchanged
+            if meta['kind'] == 'source':
+                links = [target_url for target_url in page.links[:self.max_urls_per_source]
+                         if self._is_potential_target(target_url) and not self._target_exists(target_url)]
+                if page.unchanged and links:
+                    # Links fetched fine last crawl are done; retry those that never were
+                    known = await self.db_manager.aio.run(self.fingerprints.known, links)
+                    links = [target_url for target_url in links if target_url not in known]
+                queued = sum(frontier.add(target_url, kind='candidate', category=meta['category'],
+                                          source=meta['source']) for target_url in links)
+                await self.db_manager.aio.run(self.source_tracker.record_check, url, meta['category'],
+                                              None if page.unchanged else queued)
+                return []
             
-            # Extract potential target URLs (simplified - would need source-specific logic)
-            url_pattern = r'https?://[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}(?:/[^\s]*)?'
-            found_urls = re.findall(url_pattern, html)
+            if page.unchanged:
+                # Same content as last crawl: its contacts were handled then
+                return []
             
-            # Process a limited number of URLs
-            for target_url in found_urls[:5]:
-                if self._is_potential_target(target_url):
-                    target = await self._analyze_target(scraper, target_url, category)
-                    if target:
-                        targets.append(target)
-        
-        except Exception as e:
-            logger.error(f"Error discovering from {url}: {e}")
+            target = self._target_from_page(url, page, meta['category'])
+            return [asdict(target)] if target else []
+        
+        resumed = await self.db_manager.aio.run(self.checkpoint.begin, self.resume)
+        async with self._scraper_from_config() as scraper:
+            frontier = CrawlFrontier(scraper, handle_page, self.max_concurrent_hosts, self.checkpoint)
+            if resumed:
+                frontier.restore(*await self.db_manager.aio.run(self.checkpoint.load))
+                for source, (done, total) in (await self.db_manager.aio.run(self.checkpoint.source_progress)).items():
+                    logger.info(f"Resuming {source}: {done}/{total} pages done")
+            else:
+                for source in sources:
+                    frontier.add(source['url'], kind='source', category=source.get('category', 'startup'),
+                                 source=source['url'])
+                await frontier.save()
+            await frontier.run()
         
+
+        targets = [Target(**result) for result in frontier.results]
+        logger.info(f"Crawled {len(frontier.visited)} URLs across {frontier.host_count} hosts "
+                    f"({unchanged} unchanged since last crawl), found {len(targets)} targets")
         return targets
     
     def _is_potential_target(self, url: str) -> bool:
         """Determine if a URL is a potential target"""
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower()
-        
-        # Skip known non-targets
-        skip_domains = ['google.com', 'facebook.com', 'twitter.com', 'linkedin.com']
-        if any(skip in domain for skip in skip_domains):
-            return False
-        
-        # Look for startup/business indicators
-        business_indicators = ['startup', 'company', 'corp', 'inc', 'llc', 'ltd']
-        return any(indicator in domain for indicator in business_indicators)
+        # Skip blocklisted domains, then look for startup/business indicators
+        return self.contact_rules.is_potential_target(urlparse(url).netloc)
     
-    async def _analyze_target(self, scraper: WebScraper, url: str, category: str) -> Optional[Target]:
-        """Analyze a potential target URL"""
-        try:
-            html = await scraper.fetch_page(url)
-            if not html:
-                return None
-            
-            contact_info = scraper.extract_contact_info(html, url)
-            
-            # Extract company name from title or domain
-            title_match = re.search(r'<title[^>]*>([^<]+)</title>', html, re.IGNORECASE)
-            name = title_match.group(1).strip() if title_match else urlparse(url).netloc
-            
-            # Create target if we found contact info
-            if contact_info['emails']:
-                target = Target(
-                    name=name,
-                    url=url,
-                    category=category,
-                    email=contact_info['emails'][0],
-                    contact_name=contact_info['names'][0] if contact_info['names'] else "",
-                    description=f"Discovered from {category}",
-                    priority=2
-                )
-                return target
-        
-        except Exception as e:
-            logger.error(f"Error analyzing target {url}: {e}")
+    def _target_from_page(self, url: str, page: PageContacts, category: str) -> Optional[Target]:
+        """Build a target from a fetched page if it exposes contact info"""
+        # Company name from title or domain
+        name = page.title or urlparse(url).netloc
+        
+        # Create target if we found contact info
+        if page.emails:
+            return Target(
+                name=name,
+                url=url,
+                category=category,
+                email=page.emails[0],
+                contact_name=page.names[0] if page.names else "",
+                description=f"Discovered from {category}",
+                priority=2
+            )
         
         return None
 
 class MessageTemplates:
     """Manages personalized message templates"""
     
-    @staticmethod
-    def get_template(category: str, target: Target) -> Tuple[str, str]:
+    store = TemplateStore(Path(__file__).parent / 'templates' / 'outreach')
+    
+    @classmethod
+    def configure(cls, config: Dict):
+        """Use the template directory and reload interval from the config's templates section"""
+        if config.get('directory') or 'check_interval' in config:
+            cls.store = TemplateStore(config.get('directory') or cls.store.directory,
+                                      check_interval=float(config.get('check_interval', 2.0)))
+    
+    @classmethod
+    def get_template(cls, category: str, target: Target) -> Tuple[str, str]:
         """Get subject and message template for a target category"""
-        
-        templates = {
-            'startup_publications': {
-                'subject': f"Partnership Opportunity: Open Build + {target.name}",
-                'message': f"""Hi {target.contact_name or 'there'},
-
-I hope this email finds you well. I'm reaching out from Open Build, a nonprofit organization dedicated to training and mentoring junior developers in partnership with Buildly Labs.
-
-We've been following {target.name}'s excellent work in the startup ecosystem, and I believe there's a valuable partnership opportunity worth exploring.
-
-**What We Offer:**
-• Comprehensive junior developer training programs
-• Mentorship from senior developers
-• Corporate training solutions for scaling teams
-• Open source contribution opportunities
-
-**Partnership Opportunities:**
-• Feature our success stories and developer profiles
-• Collaborate on content about developer career growth
-• Sponsor our training programs for underserved communities
-• Access to our network of trained developers for hiring
-
-We'd love to discuss how Open Build can support {target.name}'s mission while helping more developers start their careers.
-
-Would you be available for a brief 15-minute call next week to explore potential collaboration?
-
-Best regards,
-Open Build Team
-team@open.build
-https://open.build
-
-P.S. We're also working on some exciting new initiatives in AI-powered developer education that might interest your audience."""
-            },
-            
-            'startup': {
-                'subject': f"Junior Developer Training Solutions for {target.name}",
-                'message': f"""Hello {target.contact_name or 'there'},
-
-I'm reaching out from Open Build, where we specialize in training junior developers and helping companies build strong development teams.
-
-I noticed {target.name} is likely scaling your engineering team, and I wanted to share how we can help accelerate your junior developers' growth while reducing your training overhead.
-
-**Our Training Programs Include:**
-• Structured mentorship programs
-• Real-world project experience
-• Industry-standard tools and practices
-• Soft skills development for team integration
-
-**What Makes Us Different:**
-• Partnership with Buildly Labs for real project experience
-• Focus on practical skills over theoretical knowledge
-• Ongoing support and community access
-• Affordable rates for startups
-
-**Results We've Achieved:**
-• 90%+ job placement rate for our graduates
-• Average 40% reduction in onboarding time for junior hires
-• Strong retention rates due to comprehensive preparation
-
-Would you be interested in a brief conversation about how Open Build can support {target.name}'s growth? I'd love to learn more about your current challenges and share how we might help.
-
-Best regards,
-Open Build Team
-team@open.build
-https://open.build
-
-*Currently offering special rates for early-stage startups*"""
-            },
-            
-            'influencer': {
-                'subject': f"Collaboration Opportunity: Open Build x {target.name}",
-                'message': f"""Hi {target.contact_name or 'there'},
-
-I've been following your work in the developer community, and I'm impressed by your impact on helping developers grow their careers.
-
-I'm reaching out from Open Build, a nonprofit focused on training junior developers and bridging the gap between education and industry-ready skills.
-
-**Why I'm Reaching Out:**
-Your audience would benefit from learning about our proven pathways from bootcamp/self-taught to professional developer roles.
-
-**Collaboration Ideas:**
-• Guest content about junior developer career paths
-• Featuring success stories from our program graduates
-• Co-hosting workshops on developer career growth
-• Sponsorship opportunities for our community programs
-
-**What We Bring:**
-• Real success stories and data from our programs
-• Access to our network of mentors and industry professionals
-• Unique insights into the junior developer job market
-• Partnership with Buildly Labs for practical experience
-
-We're always looking for authentic ways to reach developers who could benefit from mentorship and structured career guidance.
-
-Would you be open to a brief chat about potential collaboration? I'd love to learn more about your content strategy and see where there might be synergy.
-
-Best regards,
-Open Build Team
-team@open.build
-https://open.build
-
-*P.S. Happy to provide exclusive insights or data for your content if there's a good fit*"""
-            },
-            
-            'community': {
-                'subject': f"Community Partnership: Open Build + {target.name}",
-                'message': f"""Hello {target.contact_name or 'Community Team'},
-
-I hope you're doing well! I'm reaching out from Open Build, a nonprofit organization dedicated to training junior developers and creating pathways into tech careers.
-
-We've been impressed by {target.name}'s commitment to supporting the developer community, and I believe there's an opportunity for meaningful collaboration.
-
-**Partnership Opportunities:**
-• Hosting career development workshops for your members
-• Providing mentorship opportunities through our network
-• Offering special access to our training programs
-• Cross-promotion of community events and initiatives
-
-**What We Bring to the Partnership:**
-• Experienced mentors from industry-leading companies
-• Structured career development programs
-• Job placement support and industry connections
-• Workshop content on practical development skills
-
-**Our Impact:**
-• Trained 100+ junior developers with 90%+ placement rate
-• Strong partnerships with companies looking to hire
-• Focus on underrepresented communities in tech
-• Sustainable, community-driven approach to education
-
-We'd love to explore how Open Build can support {target.name}'s members while strengthening both our communities.
-
-Would you be interested in a brief conversation about potential collaboration? I'm happy to work around your schedule.
-
-Best regards,
-Open Build Team
-team@open.build
-https://open.build
-
-*Building stronger developer communities together*"""
-            }
-        }
-        
-        # Default template if category not found
-        default_template = templates.get(category, templates['startup'])
-        return default_template['subject'], default_template['message']
+        _, subject, message = cls.store.render(category, target)
+        return subject, message
+    
+    @classmethod
+    def render(cls, target: Target) -> Tuple[str, str, str]:
+        """(template name, subject, message) for a target's category"""
+        return cls.store.render(target.category, target)
+    
+    @classmethod
+    def render_batch(cls, targets: Iterable[Target]) -> Iterator[Tuple[Target, str, str]]:
+        """(target, subject, message) for each target, using its category's template"""
+        for target in targets:
+            _, subject, message = cls.store.render(target.category, target)
+            yield target, subject, message
 
 class AnalyticsManager:
     """Handles analytics collection from various sources"""
     
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, config: Dict = None,
+                 providers: Optional[List[AnalyticsProvider]] = None):
+        config = config or {}
         self.db_manager = db_manager
-        
-    async def collect_website_analytics(self) -> Dict:
+        self.engine = AnalyticsEngine(
+            db_manager,
+            providers if providers is not None else default_providers(),
+            ttl=float(config.get('cache_ttl_minutes', 60)) * 60,
+            budgets=config.get('daily_budget', {})
+        )
+        self.db_manager.connections.register('insert_analytics', """
+            INSERT OR REPLACE INTO analytics_tracking 
+            (date, website_visitors, website_page_views, youtube_views, youtube_subscribers,
+             github_stars, github_forks, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """)
+    
+    async def collect_all(self) -> Dict[str, Dict]:
+        """Collect every provider concurrently on one HTTP session"""
+        return await self.engine.collect()
+    
+    async def _collect_one(self, name: str, session: aiohttp.ClientSession = None) -> Dict:
+        return (await self.engine.collect([name], session))[name]
+    
+    async def collect_website_analytics(self, session: aiohttp.ClientSession = None) -> Dict:
         """Collect website analytics from Google Analytics or similar"""
-        analytics = {
-            'visitors': 0,
-            'page_views': 0,
-            'bounce_rate': 0,
-            'avg_session_duration': 0,
-            'top_pages': []
-        }
-        
-        try:
-            # For now, we'll simulate analytics - in production, integrate with Google Analytics API
-            # You would need to set up Google Analytics API credentials
-            ga_api_key = os.getenv('GOOGLE_ANALYTICS_API_KEY')
-            ga_view_id = os.getenv('GOOGLE_ANALYTICS_VIEW_ID')
-            
-            if ga_api_key and ga_view_id:
-                # Real Google Analytics API call would go here
-                # For now, return simulated data
-                analytics.update({
-                    'visitors': random.randint(100, 500),
-                    'page_views': random.randint(300, 1500),
-                    'bounce_rate': round(random.uniform(40, 70), 2),
-                    'avg_session_duration': round(random.uniform(120, 300), 2),
-                    'top_pages': ['/portfolio', '/services', '/about', '/contact']
-                })
-            else:
-                logger.warning("Google Analytics credentials not configured")
-                
-        except Exception as e:
-            logger.error(f"Error collecting website analytics: {e}")
-            
-        return analytics
+        return await self._collect_one('website', session)
     
-    async def collect_youtube_analytics(self) -> Dict:
+    async def collect_youtube_analytics(self, session: aiohttp.ClientSession = None) -> Dict:
         """Collect YouTube analytics"""
-        analytics = {
-            'total_views': 0,
-            'subscribers': 0,
-            'total_videos': 0,
-            'recent_video_performance': [],
-            'top_performing_videos': []
-        }
-        
-        try:
-            youtube_api_key = os.getenv('YOUTUBE_API_KEY')
-            youtube_channel_id = os.getenv('YOUTUBE_CHANNEL_ID')
-            
-            if youtube_api_key and youtube_channel_id:
-                # YouTube API calls would go here
-                # For now, simulate data
-                analytics.update({
-                    'total_views': random.randint(1000, 10000),
-                    'subscribers': random.randint(50, 500),
-                    'total_videos': random.randint(10, 50),
-                    'recent_video_performance': [
-                        {'title': 'Junior Developer Career Guide', 'views': random.randint(100, 1000)},
-                        {'title': 'Open Build Training Overview', 'views': random.randint(50, 500)}
-                    ]
-                })
-            else:
-                logger.warning("YouTube API credentials not configured")
-                
-        except Exception as e:
-            logger.error(f"Error collecting YouTube analytics: {e}")
-            
-        return analytics
+        return await self._collect_one('youtube', session)
     
-    async def collect_social_media_analytics(self) -> Dict:
+    async def collect_social_media_analytics(self, session: aiohttp.ClientSession = None) -> Dict:
         """Collect social media analytics"""
-        analytics = {
-            'twitter_followers': 0,
-            'linkedin_followers': 0,
-            'github_stars': 0,
-            'github_forks': 0,
-            'mentions': []
-        }
-        
-        try:
-            # GitHub API (public, no auth needed for basic stats)
-            github_repo = os.getenv('GITHUB_REPO', 'open-build/website')
-            if github_repo:
-                github_url = f"https://api.github.com/repos/{github_repo}"
-                response = requests.get(github_url, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    analytics.update({
-                        'github_stars': data.get('stargazers_count', 0),
-                        'github_forks': data.get('forks_count', 0)
-                    })
-                    
-        except Exception as e:
-            logger.error(f"Error collecting social media analytics: {e}")
-            
-        return analytics
+        return await self._collect_one('social', session)
     
     def store_analytics(self, website_data: Dict, youtube_data: Dict, social_data: Dict):
         """Store analytics in database"""
-        conn = sqlite3.connect(self.db_manager.db_path)
-        cursor = conn.cursor()
-        
         today = datetime.now().strftime('%Y-%m-%d')
         
-        cursor.execute("""
-            INSERT OR REPLACE INTO analytics_tracking 
-            (date, website_visitors, website_page_views, youtube_views, youtube_subscribers,
-             github_stars, github_forks, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            today,
-            website_data.get('visitors', 0),
-            website_data.get('page_views', 0),
-            youtube_data.get('total_views', 0),
-            youtube_data.get('subscribers', 0),
-            social_data.get('github_stars', 0),
-            social_data.get('github_forks', 0),
-            datetime.now().isoformat()
-        ))
-        
-        conn.commit()
-        conn.close()
+        values = {
+            'website_visitors': website_data.get('visitors', 0),
+            'website_page_views': website_data.get('page_views', 0),
+            'youtube_views': youtube_data.get('total_views', 0),
+            'youtube_subscribers': youtube_data.get('subscribers', 0),
+            'github_stars': social_data.get('github_stars', 0),
+            'github_forks': social_data.get('github_forks', 0)
+        }
+        
+        with self.db_manager.transaction() as conn:
+            ANALYTICS_ROLLUP.record(conn, today, values)
+            self.db_manager.execute('insert_analytics', (today, *values.values(), datetime.now().isoformat()))
 
 class ResponseTracker:
     """Tracks responses to outreach emails"""
     
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
+        self.db_manager.connections.register('insert_response', """
+            INSERT INTO responses 
+            (target_id, response_type, response_content, sentiment, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        """)
+        self.db_manager.connections.register('recent_responses', """
+            SELECT t.name, t.url, r.response_type, r.response_content, r.sentiment, r.created_at
+            FROM responses r
+            JOIN targets t ON r.target_id = t.id
+            WHERE r.created_at >= ?
+            ORDER BY r.created_at DESC
+        """)
+        self.db_manager.connections.register('count_responses_between', """
+            SELECT COUNT(*) FROM responses WHERE created_at >= ? AND created_at < ?
+        """)
     
     def log_response(self, target_url: str, response_type: str, content: str, sentiment: str = "neutral"):
         """Log a response from a target"""
-        conn = sqlite3.connect(self.db_manager.db_path)
-        cursor = conn.cursor()
+        target_id = self.db_manager.get_target_id(target_url)
         
-        # Get target ID
-        cursor.execute("SELECT id FROM targets WHERE url = ?", (target_url,))
-        result = cursor.fetchone()
-        
-        if result:
-            target_id = result[0]
-            cursor.execute("""
-                INSERT INTO responses 
-                (target_id, response_type, response_content, sentiment, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (target_id, response_type, content, sentiment, datetime.now().isoformat()))
-            
-            conn.commit()
-        
-        conn.close()
+        if target_id is not None:
+            with self.db_manager.transaction():
+                self.db_manager.execute('insert_response', (
+                    target_id, response_type, content, sentiment, datetime.now().isoformat()))
+    
+    def count_responses_on(self, day: str) -> int:
+        """Number of responses received on a day (YYYY-MM-DD)"""
+        next_day = (datetime.fromisoformat(day) + timedelta(days=1)).strftime('%Y-%m-%d')
+        return self.db_manager.execute('count_responses_between', (day, next_day)).fetchone()[0]
     
     def get_recent_responses(self, days: int = 7) -> List[Dict]:
         """Get responses from the last N days"""
-        conn = sqlite3.connect(self.db_manager.db_path)
-        cursor = conn.cursor()
-        
         cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
         
-        cursor.execute("""
-            SELECT t.name, t.url, r.response_type, r.response_content, r.sentiment, r.created_at
-            FROM responses r
-            JOIN targets t ON r.target_id = t.id
-            WHERE r.created_at >= ?
-            ORDER BY r.created_at DESC
-        """, (cutoff_date,))
+        cursor = self.db_manager.execute('recent_responses', (cutoff_date,))
         
         responses = []
         for row in cursor.fetchall():
@@ -998,7 +1614,6 @@ class ResponseTracker:
                 'date': row[5]
             })
         
-        conn.close()
         return responses
 
 class SourceDiscoveryTracker:
@@ -1006,38 +1621,47 @@ class SourceDiscoveryTracker:
     
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
-    
-    def log_new_source(self, source_url: str, source_type: str, discovery_method: str, targets_found: int = 0):
-        """Log a newly discovered source"""
-        conn = sqlite3.connect(self.db_manager.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
+        self.db_manager.connections.register('insert_source', """
             INSERT OR IGNORE INTO discovered_sources
             (source_url, source_type, discovery_method, potential_targets_found, 
              last_checked, created_at)
             VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            source_url, source_type, discovery_method, targets_found,
-            datetime.now().isoformat(), datetime.now().isoformat()
-        ))
-        
-        conn.commit()
-        conn.close()
+        """)
+        self.db_manager.connections.register('check_source', """
+            UPDATE discovered_sources
+            SET last_checked = ?, potential_targets_found = COALESCE(?, potential_targets_found)
+            WHERE source_url = ?
+        """)
+        self.db_manager.connections.register('recent_sources', """
+            SELECT source_url, source_type, discovery_method, potential_targets_found, created_at
+            FROM discovered_sources
+            WHERE created_at >= ?
+            ORDER BY created_at DESC
+        """)
+    
+    def log_new_source(self, source_url: str, source_type: str, discovery_method: str, targets_found: int = 0):
+        """Log a newly discovered source"""
+        with self.db_manager.transaction():
+            self.db_manager.execute('insert_source', (
+                source_url, source_type, discovery_method, targets_found,
+                datetime.now().isoformat(), datetime.now().isoformat()
+            ))
+    
+    def record_check(self, source_url: str, source_type: str, targets_found: Optional[int] = None):
+        """Stamp last_checked on a crawled source, logging it on first sight"""
+        now = datetime.now().isoformat()
+        with self.db_manager.transaction():
+            cursor = self.db_manager.execute('check_source', (now, targets_found, source_url))
+            if cursor.rowcount == 0:
+                self.db_manager.execute('insert_source', (
+                    source_url, source_type, 'crawl', targets_found or 0, now, now
+                ))
     
     def get_recent_sources(self, days: int = 7) -> List[Dict]:
         """Get sources discovered in the last N days"""
-        conn = sqlite3.connect(self.db_manager.db_path)
-        cursor = conn.cursor()
-        
         cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
         
-        cursor.execute("""
-            SELECT source_url, source_type, discovery_method, potential_targets_found, created_at
-            FROM discovered_sources
-            WHERE created_at >= ?
-            ORDER BY created_at DESC
-        """, (cutoff_date,))
+        cursor = self.db_manager.execute('recent_sources', (cutoff_date,))
         
         sources = []
         for row in cursor.fetchall():
@@ -1049,7 +1673,6 @@ class SourceDiscoveryTracker:
                 'date': row[4]
             })
         
-        conn.close()
         return sources
 
 class EmailSender:
@@ -1063,35 +1686,81 @@ class EmailSender:
         self.from_email = config['from_email']
         self.from_name = config['from_name']
         self.reply_to = config['reply_to']
+        self.pool = SMTPConnectionPool(self.smtp_host, self.smtp_port, self.smtp_user, self.smtp_password,
+                                       size=int(config.get('pool_size', 2)),
+                                       starttls=config.get('starttls', True))
+        self._header_cache: Dict[str, Tuple[str, str, List[str]]] = {}
     
-    def send_email(self, to_email: str, subject: str, message: str, 
-                   bcc_email: str = None) -> bool:
-        """Send personalized outreach email"""
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def close(self):
+        """Close the pooled SMTP connections"""
+        self.pool.close()
+    
+    def _sender_headers(self, bcc_email: str) -> Tuple[str, str, List[str]]:
+        """Folded From and Bcc/Reply-To header lines plus the BCC recipients, built once per BCC list"""
+        cached = self._header_cache.get(bcc_email)
+        if cached is None:
+            cached = self._header_cache[bcc_email] = (
+                mime_header('From', f"{self.from_name} <{self.from_email}>"),
+                mime_header('Bcc', bcc_email) + mime_header('Reply-To', self.reply_to),
+                [email.strip() for email in bcc_email.split(',')]
+            )
+        return cached
+    
+    def build_message(self, to_email: str, subject: str, message: str,
+                      bcc_email: str = None) -> Tuple[List[str], bytes]:
+        """Render the MIME message; returns (envelope recipients, message bytes)"""
         # Use environment variable for BCC emails if not provided
         if bcc_email is None:
             bcc_email = os.getenv("BCC_EMAILS", "greg@open.build,greg@buildly.io")
+        from_header, bcc_headers, bcc_recipients = self._sender_headers(bcc_email)
         
         try:
-            msg = MIMEMultipart()
-            msg['From'] = f"{self.from_name} <{self.from_email}>"
-            msg['To'] = to_email
-            msg['Bcc'] = bcc_email
-            msg['Reply-To'] = self.reply_to
-            msg['Subject'] = subject
-            
-            msg.attach(MIMEText(message, 'plain'))
-            
-            # Connect to Brevo SMTP
-            server = smtplib.SMTP(self.smtp_host, self.smtp_port)
-            server.starttls()
-            server.login(self.smtp_user, self.smtp_password)
-            
-            # Send email
-            bcc_recipients = [email.strip() for email in bcc_email.split(',')]
-            recipients = [to_email] + bcc_recipients
-            text = msg.as_string()
-            server.sendmail(self.from_email, recipients, text)
-            server.quit()
+            body = message.encode('ascii')
+            if b'\r' in body:
+                body = body.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+            body = body.replace(b'\n', b'\r\n')
+            charset, transfer_encoding = 'us-ascii', '7bit'
+        except UnicodeEncodeError:
+            body = base64.encodebytes(message.encode('utf-8')).replace(b'\n', b'\r\n')
+            charset, transfer_encoding = 'utf-8', 'base64'
+        
+        boundary = '=' * 15 + '%019d' % random.randrange(sys.maxsize) + '=='
+        head = (
+            f'Content-Type: multipart/mixed; boundary="{boundary}"\r\nMIME-Version: 1.0\r\n'
+            f'{from_header}{mime_header("To", to_email)}{bcc_headers}{mime_header("Subject", subject)}\r\n'
+            f'--{boundary}\r\nContent-Type: text/plain; charset="{charset}"\r\nMIME-Version: 1.0\r\n'
+            f'Content-Transfer-Encoding: {transfer_encoding}\r\n\r\n'
+        )
+        payload = head.encode('ascii') + body + f'\r\n--{boundary}--\r\n'.encode('ascii')
+        return [to_email] + bcc_recipients, payload
+    
+    def build_batch(self, targets: Iterable[Target],
+                    bcc_email: str = None) -> Iterator[Tuple[Target, List[str], bytes]]:
+        """Personalize and encode outreach emails for many targets"""
+        for target, subject, message in MessageTemplates.render_batch(targets):
+            recipients, payload = self.build_message(target.email, subject, message, bcc_email)
+            yield target, recipients, payload
+    
+    def deliver(self, to_email: str, subject: str, message: str, bcc_email: str = None):
+        """Send one email over a pooled Brevo SMTP connection; raises on failure"""
+        recipients, payload = self.build_message(to_email, subject, message, bcc_email)
+        self.pool.sendmail(self.from_email, recipients, payload)
+    
+    def deliver_queued(self, message: OutboxMessage):
+        """Send an outbox message (OutboxWorker's send callable)"""
+        self.deliver(message.to_email, message.subject, message.body)
+    
+    def send_email(self, to_email: str, subject: str, message: str, 
+                   bcc_email: str = None) -> bool:
+        """Send personalized outreach email"""
+        try:
+            self.deliver(to_email, subject, message, bcc_email)
             
             logger.info(f"Email sent successfully to {to_email}")
             return True
@@ -1117,6 +1786,8 @@ Report Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 ------------------
 • New targets discovered: {stats.get('new_targets', 0)}
 • Emails sent today: {stats.get('emails_sent', 0)}
+• Emails scheduled this run: {stats.get('emails_scheduled', 0)}
+• Emails queued: {stats.get('emails_queued', 0)} (projected completion {stats.get('projected_completion') or 'N/A'})
 • Total targets in database: {stats.get('total_targets', 0)}
 
 � TARGETS CONTACTED TODAY
@@ -1244,14 +1915,22 @@ Report Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 class OutreachAutomation:
     """Main automation system coordinator"""
     
-    def __init__(self, config_path: str = "config.json"):
+    def __init__(self, config_path: str = "config.json", resume: bool = False):
         self.config = self._load_config(config_path)
-        self.db_manager = DatabaseManager()
-        self.target_discovery = TargetDiscovery(self.db_manager)
+        self.db_manager = DatabaseManager(
+            contacts_per_org=self.config['limits'].get('contacts_per_org', 4)
+        )
+        self.target_discovery = TargetDiscovery(self.db_manager, self.config, resume=resume)
         self.email_sender = EmailSender(self.config['email'])
-        self.analytics_manager = AnalyticsManager(self.db_manager)
+        self.analytics_manager = AnalyticsManager(self.db_manager, self.config.get('analytics', {}))
         self.response_tracker = ResponseTracker(self.db_manager)
         self.source_tracker = SourceDiscoveryTracker(self.db_manager)
+        MessageTemplates.configure(self.config.get('templates', {}))
+        self.outbox = Outbox(
+            self.db_manager,
+            max_attempts=int(self.config['email'].get('max_attempts', 5)),
+            retry_backoff=float(self.config['email'].get('retry_backoff_seconds', 60))
+        )
     
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration from JSON file and substitute environment variables"""
@@ -1344,48 +2023,90 @@ class OutreachAutomation:
     
     def _record_daily_stats(self, stats: Dict, responses: List, sources: List):
         """Record daily statistics in the database and clean old data"""
-        conn = sqlite3.connect(self.db_manager.db_path)
-        cursor = conn.cursor()
-        
         today = datetime.now().strftime('%Y-%m-%d')
         
-        # Record today's stats
-        cursor.execute("""
-            INSERT OR REPLACE INTO daily_stats 
-            (date, new_targets_found, emails_sent, responses_received, total_targets)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            today,
-            stats.get('new_targets', 0),
-            stats.get('emails_sent', 0),
-            len(responses),
-            self._get_total_targets()
-        ))
+        total_targets = self._get_total_targets()
         
         # Clean old data (keep only last 30 days)
         cutoff_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
         cutoff_datetime = (datetime.now() - timedelta(days=30)).isoformat()
         
-        cursor.execute("DELETE FROM daily_stats WHERE date < ?", (cutoff_date,))
-        cursor.execute("DELETE FROM outreach_log WHERE created_at < ?", (cutoff_datetime,))
-        cursor.execute("DELETE FROM responses WHERE created_at < ?", (cutoff_datetime,))
-        cursor.execute("DELETE FROM analytics_tracking WHERE date < ?", (cutoff_date,))
+        values = {
+            'new_targets_found': stats.get('new_targets', 0),
+            'emails_sent': stats.get('emails_sent', 0),
+            # Only today's responses; the rollups sum this per day
+            'responses_received': self.response_tracker.count_responses_on(today),
+            'total_targets': total_targets
+        }
+        
+        with self.db_manager.transaction() as conn:
+            cursor = conn.cursor()
+            
+            # Record today's stats; the weekly/monthly rollups keep them past the cleanup below
+            DAILY_STATS_ROLLUP.record(conn, today, values)
+            cursor.execute("""
+                INSERT OR REPLACE INTO daily_stats 
+                (date, new_targets_found, emails_sent, responses_received, total_targets)
+                VALUES (?, ?, ?, ?, ?)
+            """, (today, *values.values()))
+            
+            cursor.execute("DELETE FROM daily_stats WHERE date < ?", (cutoff_date,))
+            cursor.execute("DELETE FROM outreach_log WHERE created_at < ?", (cutoff_datetime,))
+            cursor.execute("DELETE FROM responses WHERE created_at < ?", (cutoff_datetime,))
+            cursor.execute("DELETE FROM analytics_tracking WHERE date < ?", (cutoff_date,))
+            self.outbox.prune(cutoff_datetime)
         
-        conn.commit()
-        conn.close()
         logger.info(f"Recorded daily stats and cleaned old data: {stats}")
     
     def _get_total_targets(self) -> int:
         """Get total number of targets in database"""
-        conn = sqlite3.connect(self.db_manager.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM targets")
-        total = cursor.fetchone()[0]
-        conn.close()
-        return total
+        return self.db_manager.execute('count_targets').fetchone()[0]
+    
+    def _outbox_worker(self, max_idle: float) -> OutboxWorker:
+        email_config = self.config['email']
+        return OutboxWorker(
+            self.outbox, self.email_sender.deliver_queued,
+            max_in_flight=int(email_config.get('max_in_flight', email_config.get('pool_size', 2))),
+            max_idle=max_idle
+        )
+    
+    def _record_emails_sent(self) -> int:
+        """Bring today's emails_sent in daily_stats up to date with the outbox"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+        sent = self.outbox.count_sent_since(midnight)
+        
+        with self.db_manager.transaction() as conn:
+            row = DAILY_STATS_ROLLUP.day_values(conn, today)
+            values = dict(zip(DAILY_STATS_ROLLUP.columns, row)) if row else {'total_targets': self._get_total_targets()}
+            values['emails_sent'] = sent
+            DAILY_STATS_ROLLUP.record(conn, today, values)
+            conn.execute("""
+                INSERT INTO daily_stats (date, emails_sent, total_targets) VALUES (?, ?, ?)
+                ON CONFLICT(date) DO UPDATE SET emails_sent = excluded.emails_sent
+            """, (today, sent, values['total_targets']))
+        return sent
+    
+    async def drain_outbox(self):
+        """Deliver queued outreach emails as they come due"""
+        # Waits out gaps up to the domain spacing, so messages held back by
+        # their recipient domain still go out in this drain
+        limits = self.config['limits']
+        worker = self._outbox_worker(max_idle=float(limits.get('domain_spacing_minutes', 60)) * 60)
+        with self.email_sender:
+            delivered = await worker.run()
+        sent = await self.db_manager.aio.run(self._record_emails_sent)
+        logger.info(f"Outbox drained: {len(delivered)} delivered, {len(worker.failed)} failed, "
+                   f"{sent} sent today")
     
     async def run_daily_automation(self):
         """Run the complete daily automation process"""
+        # Every email of the run (outreach, report, error report) shares
+        # the pooled SMTP connections, closed once the run is over
+        with self.email_sender:
+            await self._run_daily_phases()
+    
+    async def _run_daily_phases(self):
         logger.info("Starting daily outreach automation...")
         
         stats = {
@@ -1396,89 +2117,87 @@ class OutreachAutomation:
         }
         
         targets_contacted = []
+        sending = None
         
         try:
             # 1. Discover new targets
             logger.info("Phase 1: Discovering new targets...")
             new_targets = await self.target_discovery.discover_targets()
             
-            for target in new_targets:
-                if self.db_manager.add_target(target):
-                    stats['new_targets'] += 1
-                    logger.info(f"Added new target: {target.name}")
+            result = await self.db_manager.aio.add_targets_bulk(new_targets)
+            await self.target_discovery.commit()
+            stats['new_targets'] = result['inserted']
+            logger.info(f"Stored discovered targets: {result['inserted']} new, "
+                       f"{result['updated']} updated, "
+                       f"{result['skipped']} skipped by per-organization limits")
             
             # 2. Get targets ready for outreach
             logger.info("Phase 2: Preparing outreach list...")
-            targets_for_outreach = self.db_manager.get_targets_for_outreach(
+            targets_for_outreach = await self.db_manager.aio.get_targets_for_outreach(
                 limit=self.config['limits']['daily_emails']
             )
             
-            # 3. Send outreach emails
-            logger.info(f"Phase 3: Sending {len(targets_for_outreach)} outreach emails...")
-            
+            # 3. Queue outreach emails, each with a send time in today's window;
+            # those already due go out while the remaining phases run, the
+            # rest are left to the outbox drain (--drain)
+            limits = self.config['limits']
+            scheduler = SendScheduler(
+                self.outbox,
+                delay=tuple(limits.get('delay_between_emails', (60, 120))),
+                domain_spacing=float(limits.get('domain_spacing_minutes', 60)) * 60,
+                daily_cap=limits['daily_emails']
+            )
+            await self.db_manager.aio.run(scheduler.load)
+            pending = await self.db_manager.aio.run(self.outbox.pending_target_ids)
             for target in targets_for_outreach:
                 try:
-                    # Get personalized message
-                    subject, message = MessageTemplates.get_template(target.category, target)
+                    target_id = await self.db_manager.aio.get_target_id(target.url)
+                    if target_id in pending:
+                        continue
+                    send_at = scheduler.assign(target.email)
+                    if send_at is None:
+                        logger.info("Daily email cap reached, remaining targets wait for the next run")
+                        break
                     
-                    # Send email
-                    success = self.email_sender.send_email(target.email, subject, message)
-                    
-                    if success:
-                        # Update database
-                        self.db_manager.update_contact_status(target.url)
-                        
-                        # Log the outreach attempt
-                        conn_log = sqlite3.connect(self.db_manager.db_path)
-                        cursor_log = conn_log.cursor()
-                        
-                        # Get target ID for logging
-                        cursor_log.execute("SELECT id FROM targets WHERE url = ?", (target.url,))
-                        target_result = cursor_log.fetchone()
-                        if target_result:
-                            target_id = target_result[0]
-                            cursor_log.execute("""
-                                INSERT INTO outreach_log 
-                                (target_id, subject, message_template, status, created_at)
-                                VALUES (?, ?, ?, ?, ?)
-                            """, (target_id, subject, 'automated_outreach', 'sent', datetime.now().isoformat()))
-                            conn_log.commit()
-                        
-                        conn_log.close()
-                        
-                        targets_contacted.append(target)
-                        stats['emails_sent'] += 1
-                        
-                        # Rate limiting between emails
-                        await asyncio.sleep(random.uniform(60, 120))
-                    else:
-                        stats['errors'] += 1
+                    # Get personalized message; the template (variant) name is logged for A/B comparison
+                    template, subject, message = MessageTemplates.render(target)
+                    await self.db_manager.aio.run(
+                        self.outbox.enqueue, target_id, target.url, target.email, subject, message,
+                        template=template, send_at=send_at
+                    )
                 
                 except Exception as e:
                     logger.error(f"Error processing target {target.name}: {e}")
                     stats['errors'] += 1
             
+            stats['emails_scheduled'] = scheduler.scheduled
+            completion = scheduler.projected_completion
+            stats['projected_completion'] = completion.strftime('%H:%M:%S') if completion else None
+            stats['template_renders'] = dict(MessageTemplates.store.render_counts)
+            logger.info(f"Phase 3: Scheduled {scheduler.scheduled} outreach emails "
+                       f"({len(pending)} still queued from earlier runs), "
+                       f"projected completion {stats['projected_completion'] or 'now'}, "
+                       f"template renders {stats['template_renders']}")
+            worker = self._outbox_worker(max_idle=0)
+            sending = asyncio.create_task(worker.run())
+            
             # 4. Collect analytics data
             logger.info("Phase 4: Collecting analytics data...")
-            website_analytics = await self.analytics_manager.collect_website_analytics()
-            youtube_analytics = await self.analytics_manager.collect_youtube_analytics()
-            social_analytics = await self.analytics_manager.collect_social_media_analytics()
-            
-            analytics_data = {
-                'website': website_analytics,
-                'youtube': youtube_analytics,
-                'social': social_analytics
-            }
+            analytics_data = await self.analytics_manager.collect_all()
             
             # Store analytics in database
-            self.analytics_manager.store_analytics(website_analytics, youtube_analytics, social_analytics)
+            await self.db_manager.aio.run(
+                self.analytics_manager.store_analytics,
+                analytics_data['website'], analytics_data['youtube'], analytics_data['social']
+            )
             
             # 4.5. Generate daily blog article (if enabled)
             if BLOG_ENABLED and os.getenv("BLOG_ENABLED", "true").lower() == "true":
                 logger.info("Phase 4.5: Generating daily training blog article...")
                 try:
                     blog_generator = BlogArticleGenerator()
-                    article = blog_generator.generate_daily_article()
+                    # Off the event loop so queued mail keeps draining
+                    article = await asyncio.to_thread(blog_generator.generate_daily_article)
                     if article:
                         logger.info(f"Generated blog article: {article['title']}")
                     else:
@@ -1488,16 +2207,33 @@ class OutreachAutomation:
             
             # 5. Get recent responses and new sources
             logger.info("Phase 5: Gathering response and source data...")
-            recent_responses = self.response_tracker.get_recent_responses(days=7)
-            new_sources = self.source_tracker.get_recent_sources(days=7)
+            recent_responses, new_sources = await asyncio.gather(
+                self.db_manager.aio.run(self.response_tracker.get_recent_responses, days=7),
+                self.db_manager.aio.run(self.source_tracker.get_recent_sources, days=7)
+            )
+            
+            # Only the sends already due are waited for; the report shows
+            # what is still queued and when the drain should finish
+            delivered = await sending
+            sending = None
+            targets_by_url = {target.url: target for target in targets_for_outreach}
+            targets_contacted = [targets_by_url[message.target_url] for message in delivered
+                                 if message.target_url in targets_by_url]
+            stats['errors'] += len(worker.failed)
+            midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+            stats['emails_sent'] = await self.db_manager.aio.run(self.outbox.count_sent_since, midnight)
+            stats['emails_queued'], last_due = await self.db_manager.aio.run(self.outbox.queued_summary)
+            stats['projected_completion'] = (datetime.fromtimestamp(max(last_due, time.time())).strftime('%H:%M:%S')
+                                             if last_due else None)
             
             # 6. Record daily stats
             logger.info("Phase 6: Recording daily statistics...")
-            self._record_daily_stats(stats, recent_responses, new_sources)
+            await self.db_manager.aio.run(self._record_daily_stats, stats, recent_responses, new_sources)
             
             # 7. Send enhanced daily report LAST - after all work is complete
             logger.info("Phase 7: Sending enhanced daily report...")
-            self.email_sender.send_daily_report(
+            await asyncio.to_thread(
+                self.email_sender.send_daily_report,
                 stats, 
                 targets_contacted, 
                 analytics_data, 
@@ -1511,16 +2247,18 @@ class OutreachAutomation:
         
         except Exception as e:
             logger.error(f"Error in daily automation: {e}")
+            if sending is not None:
+                # Let sends in progress finish so their outcome is recorded
+                await asyncio.gather(sending, return_exceptions=True)
             # Send error report using environment variables
             team_email = os.getenv("TEAM_EMAIL", "team@open.build")
             error_subject = "Open Build Outreach Automation - Error Report"
             error_message = f"An error occurred during daily automation:\n\n{str(e)}\n\nPlease check the logs for more details."
-            self.email_sender.send_email(team_email, error_subject, error_message)
+            await asyncio.to_thread(self.email_sender.send_email, team_email, error_subject, error_message)
     
     def generate_report(self) -> str:
         """Generate comprehensive outreach report"""
-        conn = sqlite3.connect(self.db_manager.db_path)
-        cursor = conn.cursor()
+        cursor = self.db_manager.connections.connection().cursor()
         
         # Get summary statistics
         cursor.execute("SELECT COUNT(*) FROM targets")
@@ -1532,10 +2270,8 @@ class OutreachAutomation:
         cursor.execute("SELECT category, COUNT(*) FROM targets GROUP BY category")
         category_breakdown = cursor.fetchall()
         
-        cursor.execute("SELECT COUNT(*) FROM outreach_log WHERE created_at >= date('now', '-7 days')")
-        emails_last_7_days = cursor.fetchone()[0]
-        
-        conn.close()
+        week_ago = (datetime.now() - timedelta(days=7)).isoformat()
+        emails_last_7_days = self.db_manager.execute('recent_outreach_count', (week_ago,)).fetchone()[0]
         
         report = f"""
 🚀 Open Build Outreach Automation Report
@@ -1553,6 +2289,33 @@ class OutreachAutomation:
         for category, count in category_breakdown:
             report += f"• {category.title()}: {count}\n"
         
+        # Emails and replies per template variant, for A/B comparison of copy
+        cursor.execute("""
+            SELECT o.message_template, COUNT(DISTINCT o.id), COUNT(DISTINCT r.target_id)
+            FROM outreach_log o
+            LEFT JOIN responses r ON r.target_id = o.target_id AND r.created_at >= o.created_at
+            WHERE o.created_at >= ? AND o.status IN ('sent', 'delivered')
+            GROUP BY o.message_template
+        """, (week_ago,))
+        template_breakdown = cursor.fetchall()
+        if template_breakdown:
+            report += "\n✉️ Templates (last 7 days):\n"
+            for template, sent, replied in template_breakdown:
+                report += f"• {template}: {sent} sent, {replied} replied\n"
+        
+        # A year of history from the monthly rollups (raw days are kept for 30 days)
+        year_ago = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
+        conn = self.db_manager.connections.connection()
+        analytics_by_month = {row['bucket']: row for row in ANALYTICS_ROLLUP.trend(conn, MONTH, year_ago)}
+        monthly_stats = DAILY_STATS_ROLLUP.trend(conn, MONTH, year_ago)
+        if monthly_stats:
+            report += "\n📅 Monthly Trends:\n"
+            for month in monthly_stats:
+                analytics = analytics_by_month.get(month['bucket'], {})
+                report += (f"• {month['bucket'][:7]}: {month['emails_sent']} emails, "
+                           f"{month['responses_received']} responses, {month['new_targets_found']} new targets, "
+                           f"{analytics.get('github_stars', 0)} GitHub stars\n")
+        
         report += f"""
 📈 Performance Metrics:
 • Average targets discovered per day: {total_targets / max(1, (datetime.now() - datetime(2024, 1, 1)).days)}
@@ -1563,6 +2326,107 @@ Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
         
         return report
+    
+    def close(self):
+        """Release caches, SMTP and database connections"""
+        self.target_discovery.close()
+        self.email_sender.close()
+        self.db_manager.close()
+
+def register_statement_owners(db_manager: DatabaseManager):
+    """Construct every class that registers named statements, so all hot queries are known"""
+    RobotsCache(db_manager)
+    FingerprintStore(db_manager)
+    CrawlCheckpoint(db_manager)
+    GitHubDiscovery(db_manager, HttpCache())
+    AnalyticsManager(db_manager)
+    ResponseTracker(db_manager)
+    SourceDiscoveryTracker(db_manager)
+    Outbox(db_manager)
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)] if ordered else 0.0
+
+def benchmark_email_sending(count: int = 200, concurrency: int = 2, pool_size: int = 2,
+                            reply_delay: float = 0.0) -> Dict:
+    """Push synthetic targets through the template and sending path into a local SMTP sink"""
+    categories = ['startup_publications', 'startup', 'influencer', 'community']
+    targets = [
+        Target(name=f"Benchmark Org {i}", url=f"https://bench{i}.example.com",
+               category=categories[i % len(categories)], email=f"contact@bench{i}.example.com",
+               contact_name=f"Contact {i}")
+        for i in range(count)
+    ]
+    template_times, mime_times, latencies = [], [], []
+    
+    with SMTPSink(reply_delay=reply_delay) as sink:
+        sender = EmailSender({
+            'smtp_host': sink.host, 'smtp_port': sink.port,
+            'smtp_user': 'benchmark', 'smtp_password': 'benchmark',
+            'from_email': 'outreach@open.build', 'from_name': 'Open Build',
+            'reply_to': 'team@open.build', 'pool_size': pool_size, 'starttls': False
+        })
+        
+        def send(target: Target):
+            started = time.perf_counter()
+            subject, message = MessageTemplates.get_template(target.category, target)
+            rendered = time.perf_counter()
+            recipients, text = sender.build_message(target.email, subject, message)
+            built = time.perf_counter()
+            sender.pool.sendmail(sender.from_email, recipients, text)
+            template_times.append(rendered - started)
+            mime_times.append(built - rendered)
+            latencies.append(time.perf_counter() - started)
+        
+        started = time.perf_counter()
+        with sender, ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(send, targets))
+        elapsed = time.perf_counter() - started
+        
+        return {
+            'messages': sink.messages,
+            'seconds': elapsed,
+            'messages_per_second': sink.messages / elapsed if elapsed else 0.0,
+            'connections': sink.connections,
+            'latency_p50_ms': _percentile(latencies, 50) * 1000,
+            'latency_p99_ms': _percentile(latencies, 99) * 1000,
+            'template_avg_ms': sum(template_times) / len(template_times) * 1000 if template_times else 0.0,
+            'mime_build_avg_ms': sum(mime_times) / len(mime_times) * 1000 if mime_times else 0.0,
+            'mime_build_p99_ms': _percentile(mime_times, 99) * 1000,
+            'bytes_received': sink.bytes_received,
+        }
+
+def benchmark_analytics_collection(rounds: int = 20, latency: float = 0.05) -> Dict:
+    """Collect the fake providers `rounds` times against a scratch database"""
+    with tempfile.TemporaryDirectory() as directory:
+        db_manager = DatabaseManager(os.path.join(directory, 'benchmark.db'))
+        engine = AnalyticsEngine(db_manager, fake_providers(latency))
+        wall_times, provider_times = [], {name: [] for name in engine.providers}
+        
+        async def run():
+            async with aiohttp.ClientSession() as session:
+                for _ in range(rounds):
+                    started = time.perf_counter()
+                    await engine.collect(session=session, use_cache=False)
+                    wall_times.append(time.perf_counter() - started)
+                    for name, seconds in engine.latencies.items():
+                        provider_times[name].append(seconds)
+        
+        try:
+            asyncio.run(run())
+        finally:
+            db_manager.close()
+    
+    sequential = sum(sum(times) for times in provider_times.values()) / rounds
+    return {
+        'rounds': rounds,
+        'providers': len(provider_times),
+        'wall_p50_ms': _percentile(wall_times, 50) * 1000,
+        'wall_p99_ms': _percentile(wall_times, 99) * 1000,
+        'sequential_avg_ms': sequential * 1000,
+        'provider_p50_ms': {name: _percentile(times, 50) * 1000 for name, times in provider_times.items()},
+    }
 
 def main():
     """Main entry point"""
@@ -1570,21 +2434,73 @@ def main():
     parser.add_argument('--run', action='store_true', help='Run daily automation')
     parser.add_argument('--report', action='store_true', help='Generate and display report')
     parser.add_argument('--config', default='config.json', help='Configuration file path')
+    parser.add_argument('--explain', action='store_true', help='Print query plans for hot database queries')
+    parser.add_argument('--drain', action='store_true',
+                        help='Deliver queued outreach emails as they come due (after --run if both are given)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Run daily automation, continuing an interrupted discovery crawl')
+    parser.add_argument('--benchmark-email', type=int, metavar='N',
+                        help='Send N synthetic emails to a local SMTP sink and report throughput')
+    parser.add_argument('--concurrency', type=int, default=2,
+                        help='Sending threads (and pooled connections) for --benchmark-email')
+    parser.add_argument('--reply-delay-ms', type=float, default=0.0,
+                        help='Simulated SMTP server latency per message for --benchmark-email')
+    parser.add_argument('--benchmark-analytics', type=int, metavar='N',
+                        help='Collect the fake analytics providers N times and report latency')
+    parser.add_argument('--provider-latency-ms', type=float, default=50.0,
+                        help='Simulated API latency per fake provider for --benchmark-analytics')
     
     args = parser.parse_args()
     
-    if args.report:
+    if args.explain:
+        db_manager = DatabaseManager()
+        register_statement_owners(db_manager)
+        for name, plan in db_manager.explain_hot_queries().items():
+            print(f"🔍 {name}")
+            for step in plan:
+                print(f"   {step}")
+        db_manager.close()
+    
+    elif args.benchmark_email:
+        result = benchmark_email_sending(args.benchmark_email, concurrency=args.concurrency,
+                                         pool_size=args.concurrency, reply_delay=args.reply_delay_ms / 1000)
+        print(f"📧 Email benchmark: {result['messages']} messages in {result['seconds']:.2f}s")
+        print(f"   Throughput: {result['messages_per_second']:.1f} msgs/sec")
+        print(f"   SMTP connections opened: {result['connections']}")
+        print(f"   Latency: p50 {result['latency_p50_ms']:.2f} ms, p99 {result['latency_p99_ms']:.2f} ms")
+        print(f"   Template render: {result['template_avg_ms']:.3f} ms avg")
+        print(f"   MIME build: {result['mime_build_avg_ms']:.3f} ms avg, p99 {result['mime_build_p99_ms']:.3f} ms")
+    
+    elif args.benchmark_analytics:
+        result = benchmark_analytics_collection(args.benchmark_analytics, args.provider_latency_ms / 1000)
+        print(f"📊 Analytics benchmark: {result['providers']} fake providers, {result['rounds']} rounds")
+        print(f"   Collection: p50 {result['wall_p50_ms']:.1f} ms, p99 {result['wall_p99_ms']:.1f} ms "
+              f"(sequential would take {result['sequential_avg_ms']:.1f} ms)")
+        for name, p50 in result['provider_p50_ms'].items():
+            print(f"   {name}: p50 {p50:.1f} ms")
+    
+    elif args.report:
         automation = OutreachAutomation(args.config)
         print(automation.generate_report())
+        automation.close()
     
-    elif args.run:
-        automation = OutreachAutomation(args.config)
-        asyncio.run(automation.run_daily_automation())
+    elif args.run or args.resume or args.drain:
+        automation = OutreachAutomation(args.config, resume=args.resume)
+        if args.run or args.resume:
+            asyncio.run(automation.run_daily_automation())
+        if args.drain:
+            asyncio.run(automation.drain_outbox())
+        automation.close()
     
     else:
         print("Open Build Outreach Automation System")
         print("Use --run to execute daily automation")
+        print("Use --drain to deliver queued outreach emails (--run --drain for both)")
+        print("Use --resume to continue an interrupted run's discovery crawl")
         print("Use --report to generate status report")
+        print("Use --explain to show query plans for hot queries")
+        print("Use --benchmark-email N to measure email throughput against a local SMTP sink")
+        print("Use --benchmark-analytics N to measure analytics collection latency with fake providers")
 
 if __name__ == "__main__":
     main()
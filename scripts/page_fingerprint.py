@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Open Build Page Fingerprints
+Exact content hash plus a 64-bit SimHash per crawled URL, so unchanged pages
+and near-identical mirrors can be recognised without re-processing them
+"""
+
+import re
+import hashlib
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Markup and scripts are dropped so the SimHash reflects visible text
+MARKUP_PATTERN = re.compile(rb'<script.*?</script>|<style.*?</style>|<[^>]*>', re.IGNORECASE | re.DOTALL)
+WORD_PATTERN = re.compile(rb'[A-Za-z0-9]{2,}')
+
+
+def simhash(features: List[bytes]) -> int:
+    """64-bit SimHash: each bit is the majority vote of the feature hashes"""
+    if not features:
+        return 0
+    hashes = [format(int.from_bytes(hashlib.blake2b(feature, digest_size=8).digest(), 'big'), '064b')
+              for feature in features]
+    threshold = len(hashes) / 2
+    # Column-wise bit counts; zip/count keep the 64 x N loop in C
+    bits = ''.join('1' if column.count('1') > threshold else '0' for column in zip(*hashes))
+    return int(bits, 2)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class PageFingerprint:
+    """Incremental fingerprint of a response body fed chunk by chunk
+
+    The content hash covers every byte. SimHash features are three-word
+    shingles of the text outside tags, limited to the first MAX_WORDS words;
+    tags cut by a chunk boundary add a little noise, which SimHash absorbs.
+    """
+
+    MAX_WORDS = 4096
+    SHINGLE = 3
+
+    def __init__(self):
+        self._hash = hashlib.blake2b(digest_size=16)
+        self._words: List[bytes] = []
+
+    def update(self, chunk: bytes):
+        self._hash.update(chunk)
+        if len(self._words) < self.MAX_WORDS:
+            text = MARKUP_PATTERN.sub(b' ', chunk)
+            self._words.extend(WORD_PATTERN.findall(text.lower())[:self.MAX_WORDS - len(self._words)])
+
+    @property
+    def content_hash(self) -> bytes:
+        return self._hash.digest()
+
+    def simhash(self) -> int:
+        words = self._words
+        shingles = [b' '.join(words[i:i + self.SHINGLE])
+                    for i in range(max(len(words) - self.SHINGLE + 1, 1))]
+        return simhash([shingle for shingle in shingles if shingle])
+
+
+def _to_signed(value: int) -> int:
+    # SQLite INTEGER is a signed 64-bit value
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+class FingerprintStore:
+    """Per-URL fingerprints kept in the page_fingerprints table
+
+    Near-duplicate lookups use four 16-bit bands of the SimHash: two hashes
+    within max_distance (<= 3) bits share at least one band exactly, so only
+    URLs in a matching band are compared. The band index is built once per
+    run. All methods run on the database thread (db_manager.aio).
+    """
+
+    BANDS = 4
+
+    def __init__(self, db_manager, max_distance: int = 3):
+        self.db_manager = db_manager
+        self.max_distance = max_distance
+        self._bands: Optional[Dict[Tuple[int, int], Set[str]]] = None
+        self._simhashes: Dict[str, int] = {}
+        self._pending: Dict[str, Tuple[bytes, int]] = {}
+        db_manager.connections.register('fingerprint_get', """
+            SELECT content_hash, simhash FROM page_fingerprints WHERE url = ?
+        """)
+        db_manager.connections.register('fingerprint_seen', """
+            UPDATE page_fingerprints SET last_checked = ? WHERE url = ?
+        """)
+        db_manager.connections.register('fingerprint_put', """
+            INSERT INTO page_fingerprints (url, content_hash, simhash, last_checked, last_changed)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                content_hash = excluded.content_hash,
+                simhash = excluded.simhash,
+                last_checked = excluded.last_checked,
+                last_changed = excluded.last_changed
+        """)
+
+    def _band_keys(self, value: int):
+        for band in range(self.BANDS):
+            yield band, (value >> (16 * band)) & 0xFFFF
+
+    def _load(self):
+        self._bands = {}
+        for url, value in self.db_manager.execute("SELECT url, simhash FROM page_fingerprints"):
+            self._index(url, _to_unsigned(value))
+
+    def _index(self, url: str, value: int):
+        previous = self._simhashes.get(url)
+        if previous is not None:
+            for key in self._band_keys(previous):
+                self._bands.get(key, set()).discard(url)
+        self._simhashes[url] = value
+        for key in self._band_keys(value):
+            self._bands.setdefault(key, set()).add(url)
+
+    def _near_duplicate(self, url: str, value: int) -> Optional[str]:
+        candidates = set()
+        for key in self._band_keys(value):
+            candidates |= self._bands.get(key, set())
+        for other in candidates:
+            if other != url and hamming_distance(value, self._simhashes[other]) <= self.max_distance:
+                return other
+        return None
+
+    def touch(self, url: str) -> bool:
+        """Mark a URL as checked; returns False if it has no fingerprint yet"""
+        with self.db_manager.transaction():
+            cursor = self.db_manager.execute('fingerprint_seen', (datetime.now().isoformat(), url))
+        return cursor.rowcount > 0
+
+    def known(self, urls: Iterable[str]) -> Set[str]:
+        """The URLs that have a fingerprint, stored or pending"""
+        urls = list(urls)
+        found = {url for url in urls if url in self._pending}
+        rest = [url for url in urls if url not in found]
+        if rest:
+            placeholders = ','.join('?' * len(rest))
+            found.update(url for (url,) in self.db_manager.execute(
+                f"SELECT url FROM page_fingerprints WHERE url IN ({placeholders})", rest))
+        return found
+
+    def classify(self, url: str, fingerprint: PageFingerprint) -> Tuple[str, Optional[str]]:
+        """Say how a fetched page relates to earlier fetches
+
+        Returns ("unchanged" | "changed" | "new" | "duplicate", duplicate_of).
+        A page whose SimHash stays within max_distance of its previous one
+        (rotating tokens, timestamps) counts as unchanged. New fingerprints
+        are held until commit(), so a page whose results were never stored
+        is fetched again next time.
+        """
+        if self._bands is None:
+            self._load()
+
+        content_hash = fingerprint.content_hash
+        row = self.db_manager.execute('fingerprint_get', (url,)).fetchone()
+        if row and row[0] == content_hash:
+            self.touch(url)
+            return 'unchanged', None
+
+        value = fingerprint.simhash()
+        if row and hamming_distance(value, _to_unsigned(row[1])) <= self.max_distance:
+            self.touch(url)
+            return 'unchanged', None
+
+        duplicate_of = self._near_duplicate(url, value)
+        self._pending[url] = (content_hash, value)
+        self._index(url, value)
+
+        if duplicate_of:
+            return 'duplicate', duplicate_of
+        return ('changed' if row else 'new'), None
+
+    def commit(self):
+        """Store the fingerprints classified since the last commit"""
+        now = datetime.now().isoformat()
+        pending, self._pending = self._pending, {}
+        with self.db_manager.transaction():
+            self.db_manager.connections.executemany('fingerprint_put', [
+                (url, content_hash, _to_signed(value), now, now)
+                for url, (content_hash, value) in pending.items()
+            ])
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Open Build SQLite Schema Migrations
+Applies numbered migrations exactly once per database, tracking the schema
+version in PRAGMA user_version so up-to-date databases skip all DDL
+"""
+
+import sqlite3
+import logging
+from typing import Callable, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+# A migration is either a sequence of SQL statements or a callable that
+# receives the connection (for data migrations that need Python logic)
+Migration = Union[Sequence[str], Callable[[sqlite3.Connection], None]]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Return the schema version recorded in the database header"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(conn: sqlite3.Connection, migrations: Sequence[Migration]) -> int:
+    """Bring a database up to date with the given migration list
+
+    Migration N (1-based position in the list) is applied when the stored
+    user_version is below N. Each migration runs in its own IMMEDIATE
+    transaction together with the version bump, so a failure leaves the
+    database at the last fully applied version. Returns the number of
+    migrations applied; a current database costs a single pragma read.
+    """
+    target_version = len(migrations)
+    if get_schema_version(conn) >= target_version:
+        return 0
+
+    applied = 0
+    for version, migration in enumerate(migrations, start=1):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-check under the write lock in case another process migrated
+            if get_schema_version(conn) >= version:
+                conn.rollback()
+                continue
+
+            if callable(migration):
+                migration(conn)
+            else:
+                for statement in migration:
+                    conn.execute(statement)
+
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+            applied += 1
+        except Exception:
+            conn.rollback()
+            logger.error(f"Schema migration {version} failed")
+            raise
+
+    logger.info(f"Applied {applied} schema migration(s), now at version {target_version}")
+    return applied
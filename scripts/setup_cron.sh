@@ -61,7 +61,7 @@ fi
 echo "\$(date): Starting Open Build daily outreach automation..." >> "$LOG_DIR/cron.log"
 
 # Run the automation with proper error handling
-"$PYTHON_PATH" "$AUTOMATION_SCRIPT" --run >> "$LOG_DIR/daily_automation.log" 2>> "$LOG_DIR/daily_automation_errors.log"
+"$PYTHON_PATH" "$AUTOMATION_SCRIPT" --run --drain >> "$LOG_DIR/daily_automation.log" 2>> "$LOG_DIR/daily_automation_errors.log"
 
 # Check exit status
 if [ \$? -eq 0 ]; then
@@ -62,7 +62,7 @@ Type=simple
 User=$USER
 WorkingDirectory=$(pwd)
 Environment=PATH=$(pwd)/outreach_env/bin
-ExecStart=$(pwd)/outreach_env/bin/python outreach_automation.py --run
+ExecStart=$(pwd)/outreach_env/bin/python outreach_automation.py --run --drain
 Restart=daily
 RestartSec=3600
 
@@ -88,6 +88,7 @@ elif [[ "$OSTYPE" == "darwin"* ]]; then
         <string>$(pwd)/outreach_env/bin/python</string>
         <string>$(pwd)/outreach_automation.py</string>
         <string>--run</string>
+        <string>--drain</string>
     </array>
     <key>WorkingDirectory</key>
     <string>$(pwd)</string>
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Open Build SMTP Connection Pool
+Reusable authenticated SMTP connections so TLS and AUTH happen once per
+batch of messages rather than once per message
+"""
+
+import time
+import socket
+import smtplib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Errors after which a connection is dropped and the send retried on a new one
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, socket.timeout, ConnectionError)
+
+
+def _needs_reconnect(error: Exception) -> bool:
+    if isinstance(error, RECONNECT_ERRORS):
+        return True
+    # 421: service not available, the server is closing the channel
+    return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code == 421
+
+
+class SMTPConnectionPool:
+    """Thread-safe pool of up to `size` logged-in SMTP connections
+
+    Idle connections are reused most-recently-used first. One that sat idle
+    longer than noop_after seconds is probed with NOOP before reuse, and
+    connections that hit a 421, a disconnect or a timeout are discarded and
+    the message retried once on a fresh connection.
+    """
+
+    def __init__(self, host: str, port: int, user: Optional[str] = None, password: Optional[str] = None,
+                 size: int = 2, timeout: float = 30.0, noop_after: float = 30.0, starttls: bool = True):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.size = size
+        self.timeout = timeout
+        self.noop_after = noop_after
+        self.starttls = starttls
+        self.connections_opened = 0
+        self._idle: List[tuple] = []  # (connection, last used)
+        self._open = 0
+        self._condition = threading.Condition()
+
+    def _connect(self) -> smtplib.SMTP:
+        conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                conn.starttls()
+            if self.user and self.password:
+                conn.login(self.user, self.password)
+        except Exception:
+            self._close(conn)
+            raise
+        self.connections_opened += 1
+        logger.debug(f"Opened SMTP connection #{self.connections_opened} to {self.host}")
+        return conn
+
+    @staticmethod
+    def _close(conn: smtplib.SMTP):
+        try:
+            conn.quit()
+        except Exception:
+            conn.close()
+
+    def _healthy(self, conn: smtplib.SMTP, last_used: float) -> bool:
+        if time.monotonic() - last_used < self.noop_after:
+            return True
+        try:
+            return conn.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _checkout(self) -> smtplib.SMTP:
+        with self._condition:
+            while not self._idle and self._open >= self.size:
+                self._condition.wait()
+            if self._idle:
+                conn, last_used = self._idle.pop()
+            else:
+                conn, last_used = None, 0.0
+                self._open += 1
+
+        if conn is not None and self._healthy(conn, last_used):
+            return conn
+        if conn is not None:
+            self._close(conn)
+        try:
+            return self._connect()
+        except Exception:
+            self._release(None)
+            raise
+
+    def _release(self, conn: Optional[smtplib.SMTP]):
+        with self._condition:
+            if conn is None:
+                self._open -= 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; it is discarded if the block raises a connection error"""
+        conn = self._checkout()
+        try:
+            yield conn
+        except Exception as e:
+            if _needs_reconnect(e):
+                self._close(conn)
+                self._release(None)
+            else:
+                self._release(conn)
+            raise
+        else:
+            self._release(conn)
+
+    def sendmail(self, from_addr: str, recipients: List[str], message) -> dict:
+        """Send one message, retrying once on a fresh connection if the link dropped"""
+        for attempt in range(2):
+            try:
+                with self.connection() as conn:
+                    return conn.sendmail(from_addr, recipients, message)
+            except Exception as e:
+                if attempt == 0 and _needs_reconnect(e):
+                    logger.info(f"SMTP connection lost ({e}), reconnecting")
+                    continue
+                raise
+
+    def close(self):
+        """QUIT every idle connection"""
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for conn, _ in idle:
+            self._close(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
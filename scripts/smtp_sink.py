@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Open Build SMTP Sink
+Local SMTP server on asyncio streams that accepts and discards every
+message, for measuring the sending path without touching Brevo
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPSink:
+    """Minimal SMTP server that accepts any AUTH, sender and recipient
+
+    Runs its own event loop in a background thread so blocking smtplib
+    clients can talk to it from the calling thread. Counts connections,
+    messages, recipients and bytes received; `reply_delay` adds a fixed
+    pause before each DATA reply to imitate a remote server's latency.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, reply_delay: float = 0.0):
+        self.host = host
+        self.port = port
+        self.reply_delay = reply_delay
+        self.connections = 0
+        self.messages = 0
+        self.recipients = 0
+        self.bytes_received = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    async def _reply(self, writer: asyncio.StreamWriter, line: str):
+        writer.write(line.encode() + b'\r\n')
+        await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            await self._reply(writer, '220 open.build sink ESMTP')
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.strip().split(b' ', 1)[0].upper()
+                if command in (b'EHLO', b'HELO'):
+                    await self._reply(writer, '250-open.build sink\r\n250-AUTH PLAIN\r\n250 8BITMIME')
+                elif command == b'AUTH':
+                    await self._reply(writer, '235 2.7.0 Authentication successful')
+                elif command == b'RCPT':
+                    self.recipients += 1
+                    await self._reply(writer, '250 2.1.5 OK')
+                elif command == b'DATA':
+                    await self._reply(writer, '354 End data with <CR><LF>.<CR><LF>')
+                    while True:
+                        data = await reader.readline()
+                        if not data or data == b'.\r\n':
+                            break
+                        self.bytes_received += len(data)
+                    if self.reply_delay:
+                        await asyncio.sleep(self.reply_delay)
+                    self.messages += 1
+                    await self._reply(writer, '250 2.0.0 Queued')
+                elif command == b'QUIT':
+                    await self._reply(writer, '221 2.0.0 Bye')
+                    break
+                else:
+                    # MAIL, RSET, NOOP and anything else
+                    await self._reply(writer, '250 OK')
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def start(self) -> int:
+        """Start serving in a background thread; returns the bound port"""
+        ready = threading.Event()
+
+        def serve():
+            self._loop = asyncio.new_event_loop()
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port))
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=serve, name='smtp-sink', daemon=True)
+        self._thread.start()
+        ready.wait()
+        logger.debug(f"SMTP sink listening on {self.host}:{self.port}")
+        return self.port
+
+    def stop(self):
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._server.close)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Open Build Template Engine
+Message templates parsed once into compiled renderers, so personalizing a
+message is a single call over the fields it uses, and a store that loads
+them from editable files and reloads them when they change
+"""
+
+import re
+import time
+import operator
+import zlib
+import hashlib
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# {field} or {field|fallback}; the fallback is used when the field is empty
+PLACEHOLDER_PATTERN = re.compile(r'\{([A-Za-z_][A-Za-z0-9_]*)(?:\|([^{}]*))?\}')
+
+
+class CompiledTemplate:
+    """A template source split once into literal text and field getters
+
+    Placeholders are resolved against attributes of the object passed to
+    render() (a Target). Field names must be plain identifiers not starting
+    with an underscore; literal braces must not appear outside placeholders.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.fields: List[Tuple[str, str]] = []
+        self._pieces: List[Tuple[str, Optional[Callable[[Any], Any]], str]] = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            field, fallback = match.group(1), match.group(2) or ''
+            if field.startswith('_'):
+                raise ValueError(f"Template field {field!r} must not start with an underscore")
+            self.fields.append((field, fallback))
+            self._pieces.append((self._literal(source[position:match.start()]), operator.attrgetter(field), fallback))
+            position = match.end()
+        self._tail = self._literal(source[position:])
+
+    @staticmethod
+    def _literal(text: str) -> str:
+        if '{' in text or '}' in text:
+            raise ValueError(f"Unexpected brace in template text: {text[:60]!r}")
+        return text
+
+    def render(self, context: Any) -> str:
+        parts = []
+        for literal, getter, fallback in self._pieces:
+            parts.append(literal)
+            parts.append(str(getter(context) or fallback))
+        parts.append(self._tail)
+        return ''.join(parts)
+
+
+@dataclass
+class MessageTemplate:
+    """One compiled template file: a category's copy or an A/B variant of it"""
+    name: str
+    category: str
+    subject: CompiledTemplate
+    body: CompiledTemplate
+    digest: str
+
+
+def parse_template(name: str, text: str) -> MessageTemplate:
+    """Compile a template file: a "Subject: ..." line, a blank line, then the body"""
+    header, separator, body = text.partition('\n\n')
+    if not separator or not header.startswith('Subject:') or '\n' in header:
+        raise ValueError(f"Template {name} must start with a 'Subject:' line followed by a blank line")
+    # The file's final newline isn't part of the message
+    if body.endswith('\n'):
+        body = body[:-1]
+    return MessageTemplate(
+        name=name,
+        category=name.split('.', 1)[0],
+        subject=CompiledTemplate(header[len('Subject:'):].strip()),
+        body=CompiledTemplate(body),
+        digest=hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+    )
+
+
+class TemplateStore:
+    """Outreach templates kept as <category>.txt files in a directory
+
+    A category may have A/B variants as <category>.<variant>.txt; each
+    target gets one variant, chosen by a stable hash of its URL so repeated
+    renders agree. The directory is rescanned at most every check_interval
+    seconds: files whose mtime or size changed are re-read, and recompiled
+    only if their content hash differs. A file that fails to parse keeps its
+    previous version. render_counts counts renders per template name.
+    """
+
+    SUFFIX = '.txt'
+
+    def __init__(self, directory, default_category: str = 'startup', check_interval: float = 2.0):
+        self.directory = Path(directory)
+        self.default_category = default_category
+        self.check_interval = check_interval
+        self.render_counts: Counter = Counter()
+        self._templates: Dict[str, MessageTemplate] = {}
+        self._stats: Dict[str, Tuple[int, int]] = {}
+        self._variants: Dict[str, List[MessageTemplate]] = {}
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _load(self, name: str, path: Path, stat) -> bool:
+        text = path.read_text(encoding='utf-8')
+        previous = self._templates.get(name)
+        self._stats[name] = (stat.st_mtime_ns, stat.st_size)
+        try:
+            template = parse_template(name, text)
+        except ValueError as e:
+            logger.error(f"Keeping previous version of template {name}: {e}")
+            return False
+        if previous and previous.digest == template.digest:
+            return False
+        self._templates[name] = template
+        logger.info(f"{'Reloaded' if previous else 'Loaded'} message template {name}")
+        return True
+
+    def refresh(self, force: bool = False):
+        """Pick up added, edited and removed template files"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return
+            changed = False
+            seen = set()
+            for path in self.directory.glob(f"*{self.SUFFIX}"):
+                name = path.name[:-len(self.SUFFIX)]
+                seen.add(name)
+                stat = path.stat()
+                if self._stats.get(name) != (stat.st_mtime_ns, stat.st_size):
+                    changed = self._load(name, path, stat) or changed
+            for name in set(self._templates) - seen:
+                logger.info(f"Message template {name} removed")
+                del self._templates[name]
+                self._stats.pop(name, None)
+                changed = True
+            if changed or not self._variants:
+                # Built aside and published in one assignment
+                variants: Dict[str, List[MessageTemplate]] = {}
+                for name in sorted(self._templates):
+                    template = self._templates[name]
+                    variants.setdefault(template.category, []).append(template)
+                self._variants = variants
+            # Only a completed scan starts the interval
+            self._checked_at = now
+
+    def select(self, category: str, target) -> MessageTemplate:
+        """The template for a category (falling back to the default category) and target"""
+        self.refresh()
+        variants = self._variants.get(category) or self._variants.get(self.default_category)
+        if not variants:
+            raise LookupError(f"No message template for {category!r} in {self.directory}")
+        if len(variants) == 1:
+            return variants[0]
+        return variants[zlib.crc32(target.url.encode('utf-8')) % len(variants)]
+
+    def render(self, category: str, target) -> Tuple[str, str, str]:
+        """(template name, subject, body) personalized for a target"""
+        template = self.select(category, target)
+        self.render_counts[template.name] += 1
+        return template.name, template.subject.render(target), template.body.render(target)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Open Build Time Series Rollups
+Weekly and monthly rollups of the per-day tables (daily_stats,
+analytics_tracking), folded in as each day is written so trends outlive
+the 30-day retention of the raw rows
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import date as Date, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+WEEK = 'week'
+MONTH = 'month'
+PERIODS = (WEEK, MONTH)
+
+
+def period_start(day: str, period: str) -> str:
+    """First day (YYYY-MM-DD) of the ISO week (Monday) or month containing `day`"""
+    value = Date.fromisoformat(day)
+    if period == WEEK:
+        return (value - timedelta(days=value.weekday())).isoformat()
+    return value.replace(day=1).isoformat()
+
+
+@dataclass(frozen=True)
+class RollupSeries:
+    """A per-day source table and its rollup table
+
+    The rollup table holds one row per (period, bucket), bucket being the
+    period's first day. `counters` are summed over the days of the bucket
+    (emails sent, visitors); `gauges` keep the value of the latest day
+    (totals such as stars or subscribers). `days` counts the days folded in.
+    A day recorded again replaces its earlier values, so record() must run
+    in the same transaction as, and before, the write of the raw row.
+    """
+
+    source: str
+    table: str
+    counters: Tuple[str, ...]
+    gauges: Tuple[str, ...]
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return self.counters + self.gauges
+
+    def create_sql(self) -> str:
+        columns = ''.join(f"{column} INTEGER NOT NULL DEFAULT 0,\n" for column in self.columns)
+        return f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                period TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                days INTEGER NOT NULL DEFAULT 0,
+                last_date TEXT NOT NULL,
+                {columns}
+                PRIMARY KEY (period, bucket)
+            )
+        """
+
+    def _upsert_sql(self) -> str:
+        columns = ', '.join(self.columns)
+        placeholders = ', '.join('?' * len(self.columns))
+        updates = [f"{column} = {column} + ?" for column in self.counters]
+        updates += [f"{column} = CASE WHEN excluded.last_date >= last_date THEN excluded.{column} ELSE {column} END"
+                    for column in self.gauges]
+        return f"""
+            INSERT INTO {self.table} (period, bucket, days, last_date, {columns})
+            VALUES (?, ?, 1, ?, {placeholders})
+            ON CONFLICT(period, bucket) DO UPDATE SET
+                days = days + ?,
+                {', '.join(updates)},
+                last_date = MAX(last_date, excluded.last_date)
+        """
+
+    def day_values(self, conn: sqlite3.Connection, day: str) -> Optional[Tuple]:
+        """The raw values currently stored for a day (its latest row), if any"""
+        return conn.execute(f"""
+            SELECT {', '.join(self.columns)} FROM {self.source}
+            WHERE date = ? ORDER BY rowid DESC LIMIT 1
+        """, (day,)).fetchone()
+
+    def _fold(self, conn: sqlite3.Connection, day: str, values: Sequence[int], previous: Optional[Sequence[int]]):
+        # On conflict counters move by the difference from the day's previous values
+        deltas = [new - ((previous[i] or 0) if previous else 0) for i, new in enumerate(values[:len(self.counters)])]
+        sql = self._upsert_sql()
+        for period in PERIODS:
+            conn.execute(sql, (period, period_start(day, period), day, *values,
+                               0 if previous else 1, *deltas))
+
+    def record(self, conn: sqlite3.Connection, day: str, values: Dict[str, int]):
+        """Fold a day's values into the weekly and monthly rollups"""
+        self._fold(conn, day, [int(values.get(column) or 0) for column in self.columns],
+                   self.day_values(conn, day))
+
+    def rebuild(self, conn: sqlite3.Connection):
+        """Recompute the rollups from the raw rows still stored"""
+        conn.execute(f"DELETE FROM {self.table}")
+        for (day,) in conn.execute(f"SELECT DISTINCT date FROM {self.source} WHERE date IS NOT NULL ORDER BY date").fetchall():
+            self._fold(conn, day, [value or 0 for value in self.day_values(conn, day)], None)
+
+    def trend(self, conn: sqlite3.Connection, period: str, since: Optional[str] = None) -> List[Dict]:
+        """Rollup rows of one period, oldest first, from the bucket containing `since`"""
+        cursor = conn.execute(f"""
+            SELECT bucket, days, {', '.join(self.columns)} FROM {self.table}
+            WHERE period = ? AND bucket >= ? ORDER BY bucket
+        """, (period, period_start(since, period) if since else ''))
+        names = [description[0] for description in cursor.description]
+        return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+
+DAILY_STATS_ROLLUP = RollupSeries(
+    source='daily_stats',
+    table='daily_stats_rollup',
+    counters=('new_targets_found', 'emails_sent', 'responses_received'),
+    gauges=('total_targets',)
+)
+
+ANALYTICS_ROLLUP = RollupSeries(
+    source='analytics_tracking',
+    table='analytics_rollup',
+    counters=('website_visitors', 'website_page_views'),
+    gauges=('youtube_views', 'youtube_subscribers', 'github_stars', 'github_forks')
+)
+
+ROLLUPS = (DAILY_STATS_ROLLUP, ANALYTICS_ROLLUP)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Open Build Target URL Index
+URL canonicalization plus an in-memory membership index over stored target
+URLs so discovery can de-duplicate candidates without a database query per URL
+"""
+
+import os
+import math
+import struct
+import hashlib
+import logging
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+logger = logging.getLogger(__name__)
+
+
+# Query parameters that only carry campaign/referral tracking
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    '_hsenc', '_hsmi', 'ref', 'ref_src',
+}
+
+# Second-level suffixes under which the registrable domain has three labels
+MULTI_PART_SUFFIXES = {
+    'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'com.au', 'net.au', 'org.au',
+    'co.nz', 'co.jp', 'co.in', 'co.za', 'com.br', 'com.mx', 'com.sg',
+}
+
+# Hosts where each first path segment is a separate organization
+HOSTED_PLATFORMS = {'github.com', 'gitlab.com', 'bitbucket.org', 'medium.com'}
+
+
+def _canonical_host(netloc: str) -> str:
+    host = netloc.lower().rsplit('@', 1)[-1]
+    if host.endswith(':80') or host.endswith(':443'):
+        host = host.rsplit(':', 1)[0]
+    if host.startswith('www.'):
+        host = host[4:]
+    return host.rstrip('.')
+
+
+def canonicalize_url(url: str) -> str:
+    """Canonical form of a target URL
+
+    Lower-cases scheme and host, upgrades http to https, drops "www.",
+    default ports, fragments, trailing slashes and tracking parameters, and
+    sorts the remaining query parameters. Idempotent.
+    """
+    url = url.strip()
+    if '://' not in url:
+        url = f"https://{url}"
+    parsed = urlparse(url)
+
+    scheme = parsed.scheme.lower()
+    if scheme == 'http':
+        scheme = 'https'
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')
+    )
+
+    canonical = f"{scheme}://{_canonical_host(parsed.netloc)}{parsed.path.rstrip('/')}"
+    if query:
+        canonical += f"?{urlencode(query)}"
+    return canonical
+
+
+def canonical_domain(url: str) -> str:
+    """Organization key for a URL: its registrable domain
+
+    Subdomains fold into their parent (blog.example.com -> example.com), and
+    on code/blog hosting platforms the owning account is part of the key
+    (github.com/open-build).
+    """
+    parsed = urlparse(url if '://' in url else f"https://{url}")
+    host = _canonical_host(parsed.netloc)
+    labels = host.split('.')
+    keep = 3 if '.'.join(labels[-2:]) in MULTI_PART_SUFFIXES else 2
+    domain = '.'.join(labels[-keep:])
+
+    if host in HOSTED_PLATFORMS:
+        owner = parsed.path.strip('/').split('/', 1)[0].lower()
+        if owner:
+            domain = f"{domain}/{owner}"
+    return domain
+
+
+def _url_digest(url: str) -> bytes:
+    return hashlib.blake2b(canonicalize_url(url).encode('utf-8'), digest_size=16).digest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over a 128-bit digest"""
+
+    MAGIC = b'OBBF'
+    HEADER = struct.Struct('<4sQIq')  # magic, bit count, hash count, high-water row id
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.bit_count = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.bit_count / capacity * math.log(2)))
+        self.bits = bytearray((self.bit_count + 7) // 8)
+
+    @property
+    def capacity(self) -> int:
+        """Number of entries the filter holds at its designed error rate"""
+        return int(self.bit_count / self.hash_count * math.log(2))
+
+    def _positions(self, digest: bytes):
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.bit_count
+
+    def add(self, digest: bytes):
+        for position in self._positions(digest):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(digest))
+
+    def save(self, path: str, high_water_id: int):
+        """Persist the filter with the highest target id it covers"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.bit_count, self.hash_count, high_water_id))
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str):
+        """Load a persisted filter; returns (filter, high_water_id) or (None, 0)"""
+        try:
+            with open(path, 'rb') as f:
+                magic, bit_count, hash_count, high_water_id = cls.HEADER.unpack(f.read(cls.HEADER.size))
+                bits = bytearray(f.read())
+        except (OSError, struct.error):
+            return None, 0
+
+        if magic != cls.MAGIC or len(bits) != (bit_count + 7) // 8:
+            return None, 0
+
+        bloom = cls.__new__(cls)
+        bloom.bit_count = bit_count
+        bloom.hash_count = hash_count
+        bloom.bits = bits
+        return bloom, high_water_id
+
+
+class TargetUrlIndex:
+    """Run-scoped set of canonical target URLs, loaded once from the database
+
+    Small and medium tables are held as an exact set of 128-bit URL digests.
+    Tables above bloom_threshold rows switch to a Bloom filter persisted next
+    to the database, which is topped up incrementally from the highest target
+    id it has seen. In that mode a tiny fraction (error_rate) of new URLs may
+    be reported as already stored and skipped.
+    """
+
+    def __init__(self, db_manager, bloom_threshold: int = 1_000_000, error_rate: float = 0.001):
+        self.db_manager = db_manager
+        self.bloom_threshold = bloom_threshold
+        self.error_rate = error_rate
+        self.bloom_path = f"{db_manager.db_path}.bloom"
+        self.loaded = False
+        self._digests = set()
+        self._bloom = None
+        self._high_water_id = 0
+
+    def load(self):
+        """Load every stored target URL into the index"""
+        row_count, max_id = self.db_manager.execute(
+            "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM targets").fetchone()
+
+        if row_count >= self.bloom_threshold:
+            self._load_bloom(row_count, max_id)
+        else:
+            self._digests = {_url_digest(url) for (url,) in
+                             self.db_manager.execute("SELECT url FROM targets")}
+            self._bloom = None
+
+        self._high_water_id = max_id
+        self.loaded = True
+        logger.info(f"Loaded URL index over {row_count} targets "
+                    f"({'bloom filter' if self._bloom else 'exact set'})")
+
+    def _load_bloom(self, row_count: int, max_id: int):
+        bloom, high_water_id = BloomFilter.load(self.bloom_path)
+        if bloom is None or high_water_id > max_id or row_count > bloom.capacity:
+            # Missing, stale (database replaced) or outgrown; rebuild with headroom
+            bloom, high_water_id = BloomFilter(row_count * 2, self.error_rate), 0
+
+        for (url,) in self.db_manager.execute(
+                "SELECT url FROM targets WHERE id > ?", (high_water_id,)):
+            bloom.add(_url_digest(url))
+        self._bloom = bloom
+        self._digests = set()
+
+    def __contains__(self, url: str) -> bool:
+        if not self.loaded:
+            self.load()
+        digest = _url_digest(url)
+        if self._bloom is not None:
+            return digest in self._bloom
+        return digest in self._digests
+
+    def add(self, url: str):
+        """Record a newly stored target URL"""
+        if not self.loaded:
+            return  # The next load() reads it from the database
+        digest = _url_digest(url)
+        if self._bloom is not None:
+            self._bloom.add(digest)
+        else:
+            self._digests.add(digest)
+
+    def save(self):
+        """Persist the Bloom filter (when in use) for the next run"""
+        if self._bloom is None:
+            return
+        # Fold in every row stored since load so the saved high-water id is exact
+        for row_id, url in self.db_manager.execute(
+                "SELECT id, url FROM targets WHERE id > ? ORDER BY id", (self._high_water_id,)):
+            self._bloom.add(_url_digest(url))
+            self._high_water_id = row_id
+        self._bloom.save(self.bloom_path, self._high_water_id)